@@ -11,7 +11,7 @@ __version__ = '1.0.0'
 
 from .config_loader import get_config, reload_config
 from .state_tracker import get_state_tracker
-from .alert_manager import get_alert_manager, Alert, AlertBatch, AlertType, AlertPriority
+from .alert_manager import get_alert_manager, Alert, AlertBatch, AlertType, AlertPriority, ContainerSample
 from .email_sender import get_email_sender
 
 __all__ = [
@@ -23,5 +23,6 @@ __all__ = [
     'Alert',
     'AlertBatch',
     'AlertType',
-    'AlertPriority'
+    'AlertPriority',
+    'ContainerSample'
 ]
\ No newline at end of file
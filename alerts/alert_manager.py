@@ -3,15 +3,19 @@ Alert Manager - Detects alert conditions and manages alert lifecycle
 """
 
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import threading
+from typing import List, Dict, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 from .state_tracker import get_state_tracker, ContainerState
 from .config_loader import get_config
 
+# Shared result for containers that raise no alerts
+_EMPTY_ALERTS: Tuple = ()
 
-class AlertType(Enum):
+
+class AlertType(str, Enum):
     """Types of alerts"""
     UNHEALTHY = "unhealthy"
     HIGH_CPU = "high_cpu"
@@ -19,14 +23,14 @@ class AlertType(Enum):
     RECOVERY = "recovery"
 
 
-class AlertPriority(Enum):
+class AlertPriority(str, Enum):
     """Alert priority levels"""
     CRITICAL = "critical"
     WARNING = "warning"
     INFO = "info"
 
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """Represents a single alert"""
     container_id: str
@@ -35,7 +39,7 @@ class Alert:
     priority: AlertPriority
     value: Optional[float]  # CPU% or RAM%, None for health alerts
     timestamp: datetime
-    history: Optional[List[float]] = None  # Historical values for context
+    history: Optional[Tuple[float, ...]] = None  # Historical values for context
     downtime: Optional[str] = None  # For recovery alerts
     
     def to_dict(self) -> Dict:
@@ -43,8 +47,8 @@ class Alert:
         return {
             'container_id': self.container_id,
             'container_name': self.container_name,
-            'alert_type': self.alert_type.value,
-            'priority': self.priority.value,
+            'alert_type': self.alert_type,
+            'priority': self.priority,
             'value': self.value,
             'timestamp': self.timestamp.isoformat(),
             'history': self.history,
@@ -52,17 +56,34 @@ class Alert:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class ContainerSample:
+    """Single stats reading for a container, as fed to the alert check"""
+    container_id: str
+    container_name: str
+    cpu_percent: float
+    ram_percent: float
+    health_status: str = "none"
+
+
+@dataclass(slots=True)
 class AlertBatch:
     """Batch of alerts to send together"""
     critical_alerts: List[Alert]
     warning_alerts: List[Alert]
     recovery_alerts: List[Alert]
     timestamp: datetime
+    _total: int = field(init=False, repr=False, compare=False)
+    _any_alerts: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute counts (batch is not modified after construction)"""
+        self._total = len(self.critical_alerts) + len(self.warning_alerts)
+        self._any_alerts = self._total > 0
     
     def has_alerts(self) -> bool:
         """Check if batch has any alerts"""
-        return bool(self.critical_alerts or self.warning_alerts)
+        return self._any_alerts
     
     def has_recovery(self) -> bool:
         """Check if batch has recovery alerts"""
@@ -70,7 +91,7 @@ class AlertBatch:
     
     def total_count(self) -> int:
         """Total number of alerts"""
-        return len(self.critical_alerts) + len(self.warning_alerts)
+        return self._total
 
 
 class AlertManager:
@@ -80,10 +101,44 @@ class AlertManager:
         """Initialize alert manager"""
         self.config = get_config()
         self.state_tracker = get_state_tracker()
+        
+        # Cached alert settings, rebuilt when the config is reloaded
+        self.cooldown_minutes = self.config.get('alerts.cooldown_minutes', 15)
+        self.recovery_cooldown = self.config.get('alerts.recovery_cooldown_minutes', 5)
+        self.include_history = self.config.get('email.include_stats_history', True)
+        self._defaults = (
+            self.config.get('thresholds.cpu_percent'),
+            self.config.get('thresholds.ram_percent')
+        )
+        self._rule_cache, self._disabled_names = self._build_rule_cache()
+    
+    def _build_rule_cache(self) -> Tuple[Dict[str, Tuple[float, float]], frozenset]:
+        """
+        Precompute per-container rules
+        
+        Returns:
+            Tuple of (dict mapping container name to (cpu_threshold, ram_threshold),
+            frozenset of container names with alerts disabled)
+        """
+        default_cpu, default_ram = self._defaults
+        cache = {}
+        disabled = set()
+        for rule in self.config.get('container_rules', []) or []:
+            name = rule.get('name')
+            if name is None or name in cache:
+                continue  # First matching rule wins
+            cache[name] = (
+                rule.get('cpu_threshold', default_cpu),
+                rule.get('ram_threshold', default_ram)
+            )
+            if rule.get('alerts_disabled', False):
+                disabled.add(name)
+        return cache, frozenset(disabled)
     
     def check_container_alerts(self, container_id: str, container_name: str,
                                cpu_percent: float, ram_percent: float,
-                               health_status: str = "none") -> List[Alert]:
+                               health_status: str = "none",
+                               now: Optional[datetime] = None) -> Sequence[Alert]:
         """
         Check single container for alert conditions
         
@@ -93,48 +148,55 @@ class AlertManager:
             cpu_percent: Current CPU percentage
             ram_percent: Current RAM percentage
             health_status: Health status
+            now: Timestamp for generated alerts (defaults to current time)
             
         Returns:
-            List of alerts for this container
+            Alerts for this container (shared empty tuple if none)
         """
         # Check if alerts disabled for this container
-        if self.config.is_container_alerts_disabled(container_name):
-            return []
+        if container_name in self._disabled_names:
+            return _EMPTY_ALERTS
+        
+        now = now or datetime.now()
         
-        alerts = []
+        # Get thresholds for this container
+        cpu_threshold, ram_threshold = self._rule_cache.get(container_name, self._defaults)
+        
+        alerts = None  # Allocated on first alert
+        tracker = self.state_tracker
         
         # Update state tracker
-        self.state_tracker.update_container(
+        tracker.update_container(
             container_id, container_name, 
             cpu_percent, ram_percent, health_status
         )
         
-        state = self.state_tracker.get_state(container_id)
+        state = tracker.get_state(container_id)
         if not state:
-            return []
+            return _EMPTY_ALERTS
         
-        # Get thresholds for this container
-        cpu_threshold = self.config.get_cpu_threshold(container_name)
-        ram_threshold = self.config.get_ram_threshold(container_name)
-        cooldown_minutes = self.config.get('alerts.cooldown_minutes', 15)
-        recovery_cooldown = self.config.get('alerts.recovery_cooldown_minutes', 5)
+        in_cooldown = state.is_in_cooldown
+        cooldown_minutes = self.cooldown_minutes
+        recovery_cooldown = self.recovery_cooldown
         
         # Check for RECOVERY (unhealthy -> healthy)
         if state.is_recovery_transition():
-            if not state.is_in_cooldown('recovery', recovery_cooldown):
+            if not in_cooldown('recovery', recovery_cooldown):
                 downtime = state.get_downtime_duration()
                 downtime_str = None
                 if downtime:
                     minutes = int(downtime.total_seconds() / 60)
                     downtime_str = f"{minutes} minutes"
                 
+                if alerts is None:
+                    alerts = []
                 alerts.append(Alert(
                     container_id=container_id,
                     container_name=container_name,
                     alert_type=AlertType.RECOVERY,
                     priority=AlertPriority.INFO,
                     value=None,
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     downtime=downtime_str
                 ))
                 state.set_alert_sent('recovery')
@@ -142,95 +204,102 @@ class AlertManager:
         
         # Check for UNHEALTHY
         elif state.is_unhealthy_transition():
-            if not state.is_in_cooldown('health', cooldown_minutes):
+            if not in_cooldown('health', cooldown_minutes):
+                if alerts is None:
+                    alerts = []
                 alerts.append(Alert(
                     container_id=container_id,
                     container_name=container_name,
                     alert_type=AlertType.UNHEALTHY,
                     priority=AlertPriority.CRITICAL,
                     value=None,
-                    timestamp=datetime.now()
+                    timestamp=now
                 ))
                 state.set_alert_sent('health')
         
         # Check for HIGH CPU (sustained)
         if state.check_sustained_high_cpu(cpu_threshold):
-            if not state.cpu_alert_active and not state.is_in_cooldown('cpu', cooldown_minutes):
+            if not state.cpu_alert_active and not in_cooldown('cpu', cooldown_minutes):
+                if alerts is None:
+                    alerts = []
                 alerts.append(Alert(
                     container_id=container_id,
                     container_name=container_name,
                     alert_type=AlertType.HIGH_CPU,
                     priority=AlertPriority.WARNING,
                     value=state.get_current_cpu(),
-                    timestamp=datetime.now(),
-                    history=state.get_cpu_history_list()
+                    timestamp=now,
+                    history=state.get_cpu_history() if self.include_history else None
                 ))
                 state.set_alert_sent('cpu')
         else:
             # Clear alert if CPU back to normal
-            self.state_tracker.clear_cpu_alert_if_normal(container_id, cpu_threshold)
+            tracker.clear_cpu_alert_if_normal(container_id, cpu_threshold)
         
         # Check for HIGH RAM (sustained)
         if state.check_sustained_high_ram(ram_threshold):
-            if not state.ram_alert_active and not state.is_in_cooldown('ram', cooldown_minutes):
+            if not state.ram_alert_active and not in_cooldown('ram', cooldown_minutes):
+                if alerts is None:
+                    alerts = []
                 alerts.append(Alert(
                     container_id=container_id,
                     container_name=container_name,
                     alert_type=AlertType.HIGH_RAM,
                     priority=AlertPriority.WARNING,
                     value=state.get_current_ram(),
-                    timestamp=datetime.now(),
-                    history=state.get_ram_history_list()
+                    timestamp=now,
+                    history=state.get_ram_history() if self.include_history else None
                 ))
                 state.set_alert_sent('ram')
         else:
             # Clear alert if RAM back to normal
-            self.state_tracker.clear_ram_alert_if_normal(container_id, ram_threshold)
+            tracker.clear_ram_alert_if_normal(container_id, ram_threshold)
         
-        return alerts
+        return alerts if alerts is not None else _EMPTY_ALERTS
     
-    def check_all_containers(self, containers_data: List[Dict]) -> AlertBatch:
+    def check_all_containers(self, containers_data: List[ContainerSample]) -> AlertBatch:
         """
         Check all containers and aggregate alerts
         
         Args:
-            containers_data: List of container stats dicts with keys:
-                - container_id
-                - container_name
-                - cpu_percent
-                - ram_percent
-                - health_status (optional)
+            containers_data: List of ContainerSample readings
         
         Returns:
             AlertBatch with all alerts found
         """
         all_alerts = []
+        now = datetime.now()
+        check_container = self.check_container_alerts
         
         # Check each container
-        for data in containers_data:
-            container_alerts = self.check_container_alerts(
-                container_id=data['container_id'],
-                container_name=data['container_name'],
-                cpu_percent=data['cpu_percent'],
-                ram_percent=data['ram_percent'],
-                health_status=data.get('health_status', 'none')
-            )
-            all_alerts.extend(container_alerts)
+        for sample in containers_data:
+            all_alerts.extend(check_container(
+                sample.container_id, sample.container_name,
+                sample.cpu_percent, sample.ram_percent,
+                sample.health_status, now
+            ))
         
         # Cleanup stale containers
-        active_ids = [data['container_id'] for data in containers_data]
+        active_ids = {sample.container_id for sample in containers_data}
         self.state_tracker.cleanup_stale_containers(active_ids)
         
-        # Separate alerts by priority
-        critical = [a for a in all_alerts if a.priority == AlertPriority.CRITICAL]
-        warning = [a for a in all_alerts if a.priority == AlertPriority.WARNING]
-        recovery = [a for a in all_alerts if a.alert_type == AlertType.RECOVERY]
-        
+        # Separate alerts by priority (single pass)
+        critical, warning, recovery = [], [], []
+        recovery_type = AlertType.RECOVERY
+        critical_priority = AlertPriority.CRITICAL
+        for a in all_alerts:
+            if a.alert_type is recovery_type:
+                recovery.append(a)
+            elif a.priority is critical_priority:
+                critical.append(a)
+            else:
+                warning.append(a)
+
         return AlertBatch(
             critical_alerts=critical,
             warning_alerts=warning,
             recovery_alerts=recovery,
-            timestamp=datetime.now()
+            timestamp=now
         )
     
     def should_send_email(self, alert_batch: AlertBatch) -> bool:
@@ -250,8 +319,9 @@ class AlertManager:
         return alert_batch.has_alerts() or alert_batch.has_recovery()
 
 
-# Global singleton
+# Global singleton (the lock keeps racing first calls from creating two)
 _alert_manager = None
+_alert_manager_lock = threading.Lock()
 
 def get_alert_manager() -> AlertManager:
     """
@@ -261,6 +331,17 @@ def get_alert_manager() -> AlertManager:
         AlertManager instance
     """
     global _alert_manager
-    if _alert_manager is None:
-        _alert_manager = AlertManager()
-    return _alert_manager
\ No newline at end of file
+    manager = _alert_manager
+    if manager is None:
+        with _alert_manager_lock:
+            manager = _alert_manager
+            if manager is None:
+                manager = _alert_manager = AlertManager()
+    return manager
+
+
+def reset_alert_manager():
+    """Drop the alert manager so the next get_alert_manager() builds it from the current config"""
+    global _alert_manager
+    with _alert_manager_lock:
+        _alert_manager = None
\ No newline at end of file
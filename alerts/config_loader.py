@@ -5,8 +5,33 @@ Configuration loader and validator for Docker Watcher Alert System
 import yaml
 import os
 import re
+import threading
 from typing import Dict, Any, List, Optional
 
+# Prefer the libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Precompiled patterns
+_ENV_RE = re.compile(r'\$\{([^}]+)\}')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Numeric field validations: (section, key, required, predicate, error message)
+_FIELD_VALIDATIONS = (
+    ('thresholds', 'cpu_percent', True, lambda v: 0 <= v <= 100,
+     "cpu_percent must be between 0 and 100"),
+    ('thresholds', 'ram_percent', True, lambda v: 0 <= v <= 100,
+     "ram_percent must be between 0 and 100"),
+    ('thresholds', 'duration_minutes', True, lambda v: v >= 1,
+     "duration_minutes must be at least 1"),
+    ('alerts', 'cooldown_minutes', True, lambda v: v >= 1,
+     "cooldown_minutes must be at least 1"),
+    ('alerts', 'recovery_cooldown_minutes', False, lambda v: v >= 1,
+     "recovery_cooldown_minutes must be at least 1"),
+)
+
 
 class ConfigLoader:
     """Loads and validates alert configuration from YAML file"""
@@ -28,6 +53,9 @@ class ConfigLoader:
         
         self.config_path = config_path
         self.config = None
+        self._flat = {}
+        self._enabled = False
+        self._rule_by_name = {}
     
     def load(self) -> Dict[str, Any]:
         """
@@ -49,16 +77,47 @@ class ConfigLoader:
             )
         
         with open(self.config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+            raw = f.read()
         
-        # Expand environment variables
-        self.config = self._expand_env_vars(self.config)
+        self.config = yaml.load(raw, Loader=SafeLoader)
+        
+        # Expand environment variables (only if any ${VAR} reference exists)
+        if '${' in raw:
+            self.config = self._expand_env_vars(self.config)
         
         # Validate configuration
         self._validate()
         
+        # Precompute dotted-path lookups
+        self._flat = {}
+        self._flatten(self.config, '', self._flat)
+        self._enabled = bool(
+            self.get('alerts.enabled', True) and self.get('email.enabled', True)
+        )
+        
+        # Index container rules by name (first matching rule wins)
+        self._rule_by_name = {}
+        for rule in self.get('container_rules', []) or []:
+            if 'name' in rule:
+                self._rule_by_name.setdefault(rule['name'], rule)
+        
         return self.config
     
+    def _flatten(self, config: Dict[str, Any], prefix: str, out: Dict[str, Any]):
+        """
+        Recursively index config values by dot-separated key path
+        
+        Args:
+            config: Configuration dict to index
+            prefix: Key path of the dict being indexed
+            out: Dict receiving the key path -> value entries
+        """
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            out[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, f"{path}.", out)
+    
     def _expand_env_vars(self, config: Any) -> Any:
         """
         Recursively expand environment variables in config
@@ -75,14 +134,15 @@ class ConfigLoader:
         elif isinstance(config, list):
             return [self._expand_env_vars(item) for item in config]
         elif isinstance(config, str):
-            # Replace ${VAR_NAME} with environment variable
-            pattern = r'\$\{([^}]+)\}'
+            if '${' not in config:
+                return config
             
+            # Replace ${VAR_NAME} with environment variable
             def replace_env(match):
                 var_name = match.group(1)
                 return os.environ.get(var_name, match.group(0))
             
-            return re.sub(pattern, replace_env, config)
+            return _ENV_RE.sub(replace_env, config)
         else:
             return config
     
@@ -93,37 +153,32 @@ class ConfigLoader:
         Raises:
             ValueError: If configuration is invalid
         """
-        if not self.config:
+        config = self.config
+        if not config:
             raise ValueError("Configuration is empty")
         
         # Required top-level keys
         required_keys = ['app', 'thresholds', 'alerts', 'email']
         for key in required_keys:
-            if key not in self.config:
+            if key not in config:
                 raise ValueError(f"Missing required configuration section: {key}")
         
         # Validate app section
-        if 'base_url' not in self.config['app']:
+        if 'base_url' not in config['app']:
             raise ValueError("Missing required field: app.base_url")
         
-        # Validate thresholds
-        thresholds = self.config['thresholds']
-        if thresholds['cpu_percent'] < 0 or thresholds['cpu_percent'] > 100:
-            raise ValueError("cpu_percent must be between 0 and 100")
-        if thresholds['ram_percent'] < 0 or thresholds['ram_percent'] > 100:
-            raise ValueError("ram_percent must be between 0 and 100")
-        if thresholds['duration_minutes'] < 1:
-            raise ValueError("duration_minutes must be at least 1")
-        
-        # Validate alerts section
-        alerts = self.config['alerts']
-        if alerts['cooldown_minutes'] < 1:
-            raise ValueError("cooldown_minutes must be at least 1")
-        if 'recovery_cooldown_minutes' in alerts and alerts['recovery_cooldown_minutes'] < 1:
-            raise ValueError("recovery_cooldown_minutes must be at least 1")
+        # Validate thresholds and alerts sections
+        for section_name, key, required, is_valid, message in _FIELD_VALIDATIONS:
+            section = config[section_name]
+            if key not in section:
+                if required:
+                    raise ValueError(f"Missing required field: {section_name}.{key}")
+                continue
+            if not is_valid(section[key]):
+                raise ValueError(message)
         
         # Validate email section
-        email = self.config['email']
+        email = config['email']
         if email.get('enabled', True):
             required_email_fields = ['smtp_server', 'smtp_port', 'sender_email', 
                                     'sender_password', 'recipient_emails']
@@ -135,13 +190,11 @@ class ConfigLoader:
                 raise ValueError("At least one recipient email is required")
             
             # Validate email format (basic check)
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            
-            if not re.match(email_pattern, email['sender_email']):
+            if not _EMAIL_RE.match(email['sender_email']):
                 raise ValueError(f"Invalid sender email format: {email['sender_email']}")
             
             for recipient in email['recipient_emails']:
-                if not re.match(email_pattern, recipient):
+                if not _EMAIL_RE.match(recipient):
                     raise ValueError(f"Invalid recipient email format: {recipient}")
             
             # Validate SMTP port
@@ -163,23 +216,11 @@ class ConfigLoader:
             config.get('thresholds.cpu_percent')  # Returns 90
             config.get('email.smtp_server')        # Returns 'smtp.gmail.com'
         """
-        if not self.config:
-            return default
-        
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key_path, default)
     
     def is_enabled(self) -> bool:
         """Check if alert system is enabled"""
-        return self.get('alerts.enabled', True) and self.get('email.enabled', True)
+        return self._enabled
     
     def get_container_rule(self, container_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -191,11 +232,7 @@ class ConfigLoader:
         Returns:
             Container-specific rules or None
         """
-        rules = self.get('container_rules', [])
-        for rule in rules:
-            if rule.get('name') == container_name:
-                return rule
-        return None
+        return self._rule_by_name.get(container_name)
     
     def get_cpu_threshold(self, container_name: str) -> float:
         """Get CPU threshold for specific container or global default"""
@@ -219,8 +256,10 @@ class ConfigLoader:
         return False
 
 
-# Singleton instance
+# Singleton instance (created on first use; the lock keeps racing first
+# calls from different threads from loading two instances)
 _config_instance = None
+_config_lock = threading.Lock()
 
 def get_config() -> ConfigLoader:
     """
@@ -230,17 +269,34 @@ def get_config() -> ConfigLoader:
         ConfigLoader instance
     """
     global _config_instance
-    if _config_instance is None:
-        _config_instance = ConfigLoader()
-        _config_instance.load()
-    return _config_instance
+    config = _config_instance
+    if config is None:
+        with _config_lock:
+            config = _config_instance
+            if config is None:
+                config = ConfigLoader()
+                config.load()
+                _config_instance = config
+    return config
 
 
 def reload_config():
     """Reload configuration from file"""
     global _config_instance
-    _config_instance = None
-    return get_config()
+    config = ConfigLoader()
+    config.load()
+    with _config_lock:
+        _config_instance = config
+    
+    # Drop the alert manager so its cached rules are rebuilt from the new config
+    from .alert_manager import reset_alert_manager
+    reset_alert_manager()
+    
+    # Refresh cached settings on an existing email sender
+    from .email_sender import reload_email_sender
+    reload_email_sender()
+    
+    return config
 
 
 # Example usage
@@ -2,263 +2,261 @@
 Email Sender - Sends alert emails via SMTP
 """
 
+import logging
 import smtplib
+import ssl
+import atexit
+import queue
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.charset import Charset
+from email.message import Message
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Optional, Tuple
 import os
 
+from jinja2 import Environment, FileSystemLoader
+
 from .config_loader import get_config
 from .alert_manager import AlertBatch, Alert, AlertType, AlertPriority
 
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+
+# UTF-8 bodies sent as 8bit instead of base64
+_UTF8 = Charset('utf-8')
+_UTF8.body_encoding = None
+
+# Resource alert types and the label used in "High <label> Usage"
+_RESOURCE_TYPES = {
+    AlertType.HIGH_CPU: "CPU",
+    AlertType.HIGH_RAM: "RAM"
+}
+
+# Section underline in plain-text emails
+_SEP = "=" * 50 + "\n\n"
+
+
+def _plural(n: int) -> str:
+    """Plural suffix for a count"""
+    return "" if n == 1 else "s"
+
 
 class EmailSender:
     """Handles sending alert emails"""
     
     def __init__(self):
         """Initialize email sender"""
-        self.config = get_config()
+        # Cached SMTP connection, opened on first send
+        self._smtp = None
+        self._apply_config()
+        
+        # Outgoing emails (and config reloads) are handled by a single background worker
+        self._queue = queue.Queue(maxsize=1024)
+        threading.Thread(target=self._worker, daemon=True).start()
+        
+        # Compile email templates once
+        self._env = Environment(
+            loader=FileSystemLoader(TEMPLATES_DIR),
+            autoescape=True,
+            auto_reload=False,
+            cache_size=-1,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self._env.globals['AlertType'] = AlertType
+        self._env.globals['resource_types'] = _RESOURCE_TYPES
+        self._alert_template = self._env.get_template('alert_email.html.j2')
+        self._recovery_template = self._env.get_template('recovery_email.html.j2')
     
-    def _load_template(self, template_name: str) -> str:
+    def reload(self):
         """
-        Load email template from file
+        Re-read configuration values cached on this sender
         
-        Args:
-            template_name: Name of template file
-            
-        Returns:
-            Template content as string
+        The reload is queued for the email worker, so it never swaps settings
+        or closes the connection in the middle of a send.
         """
-        template_path = os.path.join(
-            os.path.dirname(__file__),
-            'templates',
-            template_name
+        self._queue.put((self._reload_sync, None, None))
+    
+    def _reload_sync(self, _payload=None) -> bool:
+        """Apply a queued reload (runs on the email worker)"""
+        self._apply_config()
+        return True
+    
+    def _apply_config(self):
+        """Cache configuration values and drop any open connection"""
+        self.config = get_config()
+        
+        self._base_url = self.config.get('app.base_url', 'http://localhost:5001')
+        self._container_url = self._base_url + "/container/"
+        self._duration_minutes = self.config.get('thresholds.duration_minutes', 3)
+        self._include_plain = self.config.get('email.include_plain_text', True)
+        self._enabled = self.config.is_enabled()
+        self._recovery_enabled = self.config.get('recovery.send_email', True)
+        
+        # SMTP settings: (server, port, sender, password, use_tls, use_ssl)
+        self._smtp_cfg = (
+            self.config.get('email.smtp_server'),
+            self.config.get('email.smtp_port'),
+            self.config.get('email.sender_email'),
+            self.config.get('email.sender_password'),
+            self.config.get('email.use_tls', True),
+            self.config.get('email.use_ssl', False)
         )
+        self._ssl_context = ssl.create_default_context()
+        self._recipients = self.config.get('email.recipient_emails', [])
+        self._recipients_header = ', '.join(self._recipients)
+        self._threshold_getters = {
+            AlertType.HIGH_CPU: self.config.get_cpu_threshold,
+            AlertType.HIGH_RAM: self.config.get_ram_threshold
+        }
+        
+        # Settings may have changed, drop any open connection
+        self.close()
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Get an authenticated SMTP connection, reconnecting if needed
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        Returns:
+            Connected SMTP instance
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            self.close()
+        
+        smtp_server, smtp_port, sender_email, sender_password, use_tls, use_ssl = self._smtp_cfg
+        if use_ssl:
+            # Implicit TLS (e.g. port 465): no STARTTLS round trip
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30,
+                                      context=self._ssl_context)
+        else:
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+        try:
+            if use_tls and not use_ssl:
+                server.ehlo()
+                server.starttls(context=self._ssl_context)
+                server.ehlo()
+            server.login(sender_email, sender_password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        return server
     
-    def _render_alert_section(self, alerts: List[Alert], priority_label: str, 
-                             priority_color: str, priority_emoji: str) -> str:
+    def _send_message(self, msg: Message, server: Optional[smtplib.SMTP] = None):
         """
-        Render section of alerts with same priority
+        Send message over the cached connection, retrying once on a dropped link
         
         Args:
-            alerts: List of alerts
-            priority_label: Label (e.g., "CRITICAL ALERTS")
-            priority_color: Color code
-            priority_emoji: Emoji for priority
-            
-        Returns:
-            HTML string for section
+            msg: Message to send
+            server: Connection already obtained from _get_smtp (optional)
         """
-        if not alerts:
-            return ""
-        
-        base_url = self.config.get('app.base_url', 'http://localhost:5001')
-        
-        html = f"""
-        <div style="margin-bottom: 30px;">
-            <div style="background: {priority_color}22; border-left: 4px solid {priority_color}; 
-                        padding: 15px; border-radius: 8px; margin-bottom: 15px;">
-                <h2 style="margin: 0; color: {priority_color}; font-size: 18px;">
-                    {priority_emoji} {priority_label} ({len(alerts)})
-                </h2>
-            </div>
+        try:
+            self._deliver(server or self._get_smtp(), msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self.close()
+            self._deliver(self._get_smtp(), msg)
+    
+    def _deliver(self, server: smtplib.SMTP, msg: Message):
         """
+        Send message, falling back to base64 bodies if 8BITMIME is unsupported
         
-        for alert in alerts:
-            # Container header
-            html += f"""
-            <div style="background: #1e293b; border: 1px solid #334155; border-radius: 8px; 
-                        padding: 20px; margin-bottom: 15px; border-left: 4px solid {priority_color};">
-                <h3 style="margin: 0 0 10px 0; color: #e2e8f0; font-size: 16px;">
-                    {alert.container_name} <span style="color: #64748b; font-size: 14px;">(ID: {alert.container_id[:12]})</span>
-                </h3>
-            """
-            
-            # Alert details based on type
-            if alert.alert_type == AlertType.UNHEALTHY:
-                html += f"""
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Status:</strong> <span style="color: {priority_color};">UNHEALTHY</span>
-                </p>
-                <p style="margin: 8px 0; color: #94a3b8; font-size: 14px;">
-                    ⏰ Time: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-                </p>
-                """
-            
-            elif alert.alert_type == AlertType.HIGH_CPU:
-                threshold = self.config.get_cpu_threshold(alert.container_name)
-                html += f"""
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Issue:</strong> High CPU Usage
-                </p>
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Current:</strong> <span style="color: {priority_color}; font-size: 18px; font-weight: bold;">{alert.value:.1f}%</span>
-                    <span style="color: #64748b;"> (threshold: {threshold}%)</span>
-                </p>
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Duration:</strong> {self.config.get('thresholds.duration_minutes', 3)} minutes
-                </p>
-                """
-                
-                if alert.history:
-                    history_str = " → ".join([f"{h:.1f}%" for h in alert.history])
-                    html += f"""
-                    <p style="margin: 8px 0; color: #94a3b8; font-size: 13px;">
-                        📊 History: {history_str}
-                    </p>
-                    """
-            
-            elif alert.alert_type == AlertType.HIGH_RAM:
-                threshold = self.config.get_ram_threshold(alert.container_name)
-                html += f"""
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Issue:</strong> High RAM Usage
-                </p>
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Current:</strong> <span style="color: {priority_color}; font-size: 18px; font-weight: bold;">{alert.value:.1f}%</span>
-                    <span style="color: #64748b;"> (threshold: {threshold}%)</span>
-                </p>
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Duration:</strong> {self.config.get('thresholds.duration_minutes', 3)} minutes
-                </p>
-                """
-                
-                if alert.history:
-                    history_str = " → ".join([f"{h:.1f}%" for h in alert.history])
-                    html += f"""
-                    <p style="margin: 8px 0; color: #94a3b8; font-size: 13px;">
-                        📊 History: {history_str}
-                    </p>
-                    """
-            
-            # Link to container
-            container_url = f"{base_url}/container/{alert.container_id}"
-            html += f"""
-                <div style="margin-top: 15px;">
-                    <a href="{container_url}" 
-                       style="display: inline-block; background: #3b82f6; color: white; 
-                              padding: 8px 16px; text-decoration: none; border-radius: 6px; 
-                              font-size: 14px;">
-                        → View Container Details
-                    </a>
-                </div>
-            </div>
-            """
-        
-        html += "</div>"
-        return html
+        Args:
+            server: Connected SMTP instance
+            msg: Message to send
+        """
+        if server.has_extn('8bitmime'):
+            server.send_message(msg, mail_options=['BODY=8BITMIME'])
+            return
+        
+        for part in msg.walk():
+            if part.get('Content-Transfer-Encoding') == '8bit':
+                text = part.get_payload(decode=True).decode('utf-8')
+                del part['Content-Transfer-Encoding']
+                part.set_payload(text, 'utf-8')
+        server.send_message(msg)
+    
+    def close(self):
+        """Close the cached SMTP connection"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+        self._smtp = None
     
-    def _create_alert_email_html(self, alert_batch: AlertBatch) -> str:
+    def _subject_and_title(self, alert_batch: AlertBatch) -> Tuple[str, str]:
         """
-        Create HTML content for aggregate alert email
+        Build subject line and HTML title for aggregate alert email
         
         Args:
             alert_batch: Batch of alerts
             
         Returns:
-            HTML string
+            Tuple of (subject, title)
         """
-        # Determine subject based on priorities
-        if alert_batch.critical_alerts:
-            subject_prefix = "🚨 CRITICAL"
-        else:
-            subject_prefix = "⚠️ WARNING"
-        
         critical_count = len(alert_batch.critical_alerts)
         warning_count = len(alert_batch.warning_alerts)
         
-        # Build title
         title_parts = []
-        if critical_count > 0:
-            title_parts.append(f"{critical_count} Critical Issue{'s' if critical_count != 1 else ''}")
-        if warning_count > 0:
-            title_parts.append(f"{warning_count} Warning{'s' if warning_count != 1 else ''}")
-        
+        if critical_count:
+            title_parts.append(f"{critical_count} Critical Issue{_plural(critical_count)}")
+        if warning_count:
+            title_parts.append(f"{warning_count} Warning{_plural(warning_count)}")
         title = " + ".join(title_parts)
         
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Docker Watcher Alert</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-             background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%); color: #e2e8f0;">
-    <div style="max-width: 800px; margin: 0 auto; padding: 40px 20px;">
-        
-        <!-- Header -->
-        <div style="text-align: center; margin-bottom: 40px;">
-            <h1 style="color: #3b82f6; font-size: 32px; margin: 0 0 10px 0;">
-                Docker Watcher
-            </h1>
-            <p style="color: #94a3b8; font-size: 16px; margin: 0;">
-                Container Monitoring Alert System
-            </p>
-        </div>
-        
-        <!-- Alert Title -->
-        <div style="background: rgba(239, 68, 68, 0.15); border: 2px solid #ef4444; 
-                    border-radius: 12px; padding: 20px; margin-bottom: 30px; text-align: center;">
-            <h2 style="margin: 0; color: #ef4444; font-size: 24px;">
-                {subject_prefix}: {title}
-            </h2>
-            <p style="margin: 10px 0 0 0; color: #94a3b8; font-size: 14px;">
-                {alert_batch.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-            </p>
-        </div>
-        
-        <!-- Alerts Content -->
-        <div style="background: rgba(30, 41, 59, 0.6); border: 1px solid #334155; 
-                    border-radius: 12px; padding: 30px;">
+        if critical_count:
+            subject = f"🚨 CRITICAL: {critical_count} Container Issue{_plural(critical_count)}"
+            if warning_count:
+                subject += f" (+ {warning_count} Warning{_plural(warning_count)})"
+        else:
+            subject = f"⚠️ WARNING: {warning_count} Resource Alert{_plural(warning_count)}"
+        
+        return subject, title
+    
+    def _create_alert_email_html(self, alert_batch: AlertBatch, title: Optional[str] = None) -> str:
         """
+        Create HTML content for aggregate alert email
         
-        # Critical alerts section
-        if alert_batch.critical_alerts:
-            html += self._render_alert_section(
-                alert_batch.critical_alerts,
-                "CRITICAL ALERTS",
-                "#ef4444",
-                "🚨"
-            )
-        
-        # Warning alerts section
-        if alert_batch.warning_alerts:
-            html += self._render_alert_section(
-                alert_batch.warning_alerts,
-                "WARNING ALERTS",
-                "#f59e0b",
-                "⚠️"
-            )
-        
-        # Footer
-        base_url = self.config.get('app.base_url', 'http://localhost:5001')
-        html += f"""
-        </div>
-        
-        <!-- Footer -->
-        <div style="text-align: center; margin-top: 30px; padding-top: 20px; 
-                    border-top: 1px solid #334155;">
-            <p style="color: #64748b; font-size: 14px; margin: 0 0 10px 0;">
-                Docker Watcher Alert System
-            </p>
-            <a href="{base_url}" 
-               style="color: #3b82f6; text-decoration: none; font-size: 14px;">
-                → View Full Dashboard
-            </a>
-        </div>
-        
-    </div>
-</body>
-</html>
+        Args:
+            alert_batch: Batch of alerts
+            title: Precomputed title (see _subject_and_title)
+            
+        Returns:
+            HTML string
         """
+        if title is None:
+            _, title = self._subject_and_title(alert_batch)
         
-        return html
+        # Non-empty priority sections: (label, color, emoji, alerts)
+        sections = []
+        if alert_batch.critical_alerts:
+            sections.append(("CRITICAL ALERTS", "#ef4444", "🚨", alert_batch.critical_alerts))
+        if alert_batch.warning_alerts:
+            sections.append(("WARNING ALERTS", "#f59e0b", "⚠️", alert_batch.warning_alerts))
+        
+        return self._alert_template.render(
+            batch=alert_batch,
+            subject_prefix="🚨 CRITICAL" if alert_batch.critical_alerts else "⚠️ WARNING",
+            title=title,
+            sections=sections,
+            base_url=self._base_url,
+            container_url=self._container_url,
+            duration_minutes=self._duration_minutes,
+            threshold_getters=self._threshold_getters
+        )
     
     def _create_recovery_email_html(self, alert: Alert) -> str:
         """
@@ -270,107 +268,11 @@ class EmailSender:
         Returns:
             HTML string
         """
-        base_url = self.config.get('app.base_url', 'http://localhost:5001')
-        container_url = f"{base_url}/container/{alert.container_id}"
-        
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Docker Watcher - Container Recovered</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-             background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%); color: #e2e8f0;">
-    <div style="max-width: 800px; margin: 0 auto; padding: 40px 20px;">
-        
-        <!-- Header -->
-        <div style="text-align: center; margin-bottom: 40px;">
-            <h1 style="color: #3b82f6; font-size: 32px; margin: 0 0 10px 0;">
-                Docker Watcher
-            </h1>
-            <p style="color: #94a3b8; font-size: 16px; margin: 0;">
-                Container Monitoring Alert System
-            </p>
-        </div>
-        
-        <!-- Recovery Title -->
-        <div style="background: rgba(34, 197, 94, 0.15); border: 2px solid #22c55e; 
-                    border-radius: 12px; padding: 20px; margin-bottom: 30px; text-align: center;">
-            <h2 style="margin: 0; color: #22c55e; font-size: 24px;">
-                ✅ RESOLVED: Container Recovered
-            </h2>
-            <p style="margin: 10px 0 0 0; color: #94a3b8; font-size: 14px;">
-                {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-            </p>
-        </div>
-        
-        <!-- Recovery Details -->
-        <div style="background: rgba(30, 41, 59, 0.6); border: 1px solid #334155; 
-                    border-radius: 12px; padding: 30px;">
-            
-            <div style="background: #1e293b; border: 1px solid #334155; border-radius: 8px; 
-                        padding: 20px; border-left: 4px solid #22c55e;">
-                <h3 style="margin: 0 0 15px 0; color: #e2e8f0; font-size: 18px;">
-                    {alert.container_name}
-                </h3>
-                
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Container ID:</strong> <span style="color: #64748b;">{alert.container_id[:12]}</span>
-                </p>
-                
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Previous Status:</strong> <span style="color: #ef4444;">UNHEALTHY</span>
-                </p>
-                
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Current Status:</strong> <span style="color: #22c55e;">HEALTHY</span>
-                </p>
-        """
-        
-        if alert.downtime:
-            html += f"""
-                <p style="margin: 8px 0; color: #e2e8f0;">
-                    <strong>Downtime:</strong> <span style="color: #f59e0b;">{alert.downtime}</span>
-                </p>
-            """
-        
-        html += f"""
-                <p style="margin: 8px 0; color: #94a3b8; font-size: 14px;">
-                    ⏰ Recovered At: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-                </p>
-                
-                <div style="margin-top: 20px;">
-                    <a href="{container_url}" 
-                       style="display: inline-block; background: #22c55e; color: white; 
-                              padding: 10px 20px; text-decoration: none; border-radius: 6px; 
-                              font-size: 14px; font-weight: 600;">
-                        → View Container Details
-                    </a>
-                </div>
-            </div>
-            
-        </div>
-        
-        <!-- Footer -->
-        <div style="text-align: center; margin-top: 30px; padding-top: 20px; 
-                    border-top: 1px solid #334155;">
-            <p style="color: #64748b; font-size: 14px; margin: 0 0 10px 0;">
-                Docker Watcher Alert System
-            </p>
-            <a href="{base_url}" 
-               style="color: #3b82f6; text-decoration: none; font-size: 14px;">
-                → View Full Dashboard
-            </a>
-        </div>
-        
-    </div>
-</body>
-</html>
-        """
-        
-        return html
+        return self._recovery_template.render(
+            alert=alert,
+            base_url=self._base_url,
+            container_url=self._container_url
+        )
     
     def _create_plain_text(self, alert_batch: AlertBatch = None, recovery_alert: Alert = None) -> str:
         """
@@ -383,10 +285,11 @@ class EmailSender:
         Returns:
             Plain text string
         """
-        base_url = self.config.get('app.base_url', 'http://localhost:5001')
+        base_url = self._base_url
+        url_prefix = self._container_url
         
         if recovery_alert:
-            text = f"""
+            parts = [f"""
 Docker Watcher - Container Recovered
 =====================================
 
@@ -395,209 +298,255 @@ ID: {recovery_alert.container_id[:12]}
 
 Previous Status: UNHEALTHY
 Current Status: HEALTHY
-"""
+"""]
             if recovery_alert.downtime:
-                text += f"Downtime: {recovery_alert.downtime}\n"
+                parts.append(f"Downtime: {recovery_alert.downtime}\n")
             
-            text += f"""
+            parts.append(f"""
 Recovered At: {recovery_alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
 
-View Details: {base_url}/container/{recovery_alert.container_id}
+View Details: {url_prefix}{recovery_alert.container_id}
 
 ---
 Docker Watcher Alert System
-            """
-            return text
+            """)
+            return ''.join(parts)
         
         if alert_batch:
             # Determine title
             critical_count = len(alert_batch.critical_alerts)
             warning_count = len(alert_batch.warning_alerts)
             
-            text = f"""
+            parts = [f"""
 Docker Watcher - Container Alerts
 ===================================
 
 Timestamp: {alert_batch.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
 
-"""
+"""]
             
             if alert_batch.critical_alerts:
-                text += f"\nCRITICAL ALERTS ({critical_count})\n"
-                text += "=" * 50 + "\n\n"
+                parts.append(f"\nCRITICAL ALERTS ({critical_count})\n")
+                parts.append(_SEP)
                 
                 for alert in alert_batch.critical_alerts:
-                    text += f"Container: {alert.container_name} (ID: {alert.container_id[:12]})\n"
+                    parts.append(f"Container: {alert.container_name} (ID: {alert.container_id[:12]})\n")
                     
-                    if alert.alert_type == AlertType.UNHEALTHY:
-                        text += f"Status: UNHEALTHY\n"
+                    if alert.alert_type is AlertType.UNHEALTHY:
+                        parts.append(f"Status: UNHEALTHY\n")
                     
-                    text += f"Time: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-                    text += f"Details: {base_url}/container/{alert.container_id}\n\n"
+                    parts.append(f"Time: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                    parts.append("Details: " + url_prefix + alert.container_id + "\n\n")
             
             if alert_batch.warning_alerts:
-                text += f"\nWARNING ALERTS ({warning_count})\n"
-                text += "=" * 50 + "\n\n"
+                parts.append(f"\nWARNING ALERTS ({warning_count})\n")
+                parts.append(_SEP)
                 
                 for alert in alert_batch.warning_alerts:
-                    text += f"Container: {alert.container_name} (ID: {alert.container_id[:12]})\n"
-                    
-                    if alert.alert_type == AlertType.HIGH_CPU:
-                        text += f"Issue: High CPU Usage\n"
-                        text += f"Current: {alert.value:.1f}%\n"
-                        if alert.history:
-                            history_str = " -> ".join([f"{h:.1f}%" for h in alert.history])
-                            text += f"History: {history_str}\n"
+                    parts.append(f"Container: {alert.container_name} (ID: {alert.container_id[:12]})\n")
                     
-                    elif alert.alert_type == AlertType.HIGH_RAM:
-                        text += f"Issue: High RAM Usage\n"
-                        text += f"Current: {alert.value:.1f}%\n"
+                    kind = _RESOURCE_TYPES.get(alert.alert_type)
+                    if kind:
+                        parts.append(f"Issue: High {kind} Usage\n")
+                        parts.append(f"Current: {alert.value:.1f}%\n")
                         if alert.history:
-                            history_str = " -> ".join([f"{h:.1f}%" for h in alert.history])
-                            text += f"History: {history_str}\n"
+                            parts.append(f"History: {' -> '.join(f'{h:.1f}%' for h in alert.history)}\n")
                     
-                    text += f"Details: {base_url}/container/{alert.container_id}\n\n"
+                    parts.append("Details: " + url_prefix + alert.container_id + "\n\n")
             
-            text += "\n---\nDocker Watcher Alert System\n"
-            text += f"Dashboard: {base_url}\n"
+            parts.append("\n---\nDocker Watcher Alert System\n")
+            parts.append(f"Dashboard: {base_url}\n")
             
-            return text
+            return ''.join(parts)
         
         return "Docker Watcher Alert"
     
-    def send_alert_email(self, alert_batch: AlertBatch) -> bool:
+    def _worker(self):
+        """Drain the email queue, sending one message at a time"""
+        while True:
+            send, payload, on_complete = self._queue.get()
+            try:
+                sent = send(payload)
+                if on_complete:
+                    on_complete(sent)
+            except Exception as e:
+                logger.error("❌ Email worker error: %s", e)
+            finally:
+                self._queue.task_done()
+    
+    def _enqueue(self, send: Callable, payload,
+                 on_complete: Optional[Callable[[bool], None]]) -> bool:
         """
-        Send aggregate alert email
+        Queue an email for the background worker
+        
+        Args:
+            send: Synchronous send method to call with payload
+            payload: Alert batch or recovery alert
+            on_complete: Called with the send result once finished
+            
+        Returns:
+            True if queued
+        """
+        try:
+            self._queue.put_nowait((send, payload, on_complete))
+            return True
+        except queue.Full:
+            logger.error("❌ Email queue full, dropping message")
+            if on_complete:
+                on_complete(False)
+            return False
+    
+    def flush(self):
+        """Block until all queued emails have been processed"""
+        self._queue.join()
+    
+    def send_alert_email(self, alert_batch: AlertBatch,
+                         on_complete: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Queue aggregate alert email for sending
         
         Args:
             alert_batch: Batch of alerts to send
+            on_complete: Called with True/False once the email was sent or failed
             
         Returns:
-            True if email sent successfully
+            True if email was queued
         """
-        if not self.config.is_enabled():
-            print("⚠️  Alert system disabled in config")
+        if not self._enabled:
+            logger.warning("⚠️  Alert system disabled in config")
+            if on_complete:
+                on_complete(False)
             return False
         
         if not alert_batch.has_alerts():
+            if on_complete:
+                on_complete(False)
             return False
         
+        return self._enqueue(self._send_alert_email_sync, alert_batch, on_complete)
+    
+    def _send_alert_email_sync(self, alert_batch: AlertBatch) -> bool:
+        """
+        Send aggregate alert email
+        
+        Args:
+            alert_batch: Batch of alerts to send
+            
+        Returns:
+            True if email sent successfully
+        """
         try:
-            # Get email config
-            smtp_server = self.config.get('email.smtp_server')
-            smtp_port = self.config.get('email.smtp_port')
-            sender_email = self.config.get('email.sender_email')
-            sender_password = self.config.get('email.sender_password')
-            recipients = self.config.get('email.recipient_emails', [])
-            use_tls = self.config.get('email.use_tls', True)
+            # Connect first so nothing is rendered if the server is unreachable
+            server = self._get_smtp()
             
-            # Determine subject
-            if alert_batch.critical_alerts:
-                subject_prefix = "🚨 CRITICAL"
-                critical_count = len(alert_batch.critical_alerts)
-                warning_count = len(alert_batch.warning_alerts)
+            subject, title = self._subject_and_title(alert_batch)
+            
+            # HTML version
+            html_content = self._create_alert_email_html(alert_batch, title)
+            part2 = MIMEText(html_content, 'html', _charset=_UTF8)
+            
+            if self._include_plain:
+                # Plain text version
+                text_content = self._create_plain_text(alert_batch=alert_batch)
+                part1 = MIMEText(text_content, 'plain', _charset=_UTF8)
                 
-                if warning_count > 0:
-                    subject = f"{subject_prefix}: {critical_count} Container Issue{'s' if critical_count != 1 else ''} (+ {warning_count} Warning{'s' if warning_count != 1 else ''})"
-                else:
-                    subject = f"{subject_prefix}: {critical_count} Container Issue{'s' if critical_count != 1 else ''}"
+                msg = MIMEMultipart('alternative')
+                msg.attach(part1)
+                msg.attach(part2)
             else:
-                warning_count = len(alert_batch.warning_alerts)
-                subject = f"⚠️ WARNING: {warning_count} Resource Alert{'s' if warning_count != 1 else ''}"
+                # HTML only: send the single part without a multipart wrapper
+                msg = part2
             
-            # Create email
-            msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
-            msg['From'] = sender_email
-            msg['To'] = ', '.join(recipients)
-            
-            # Plain text version
-            text_content = self._create_plain_text(alert_batch=alert_batch)
-            part1 = MIMEText(text_content, 'plain')
-            
-            # HTML version
-            html_content = self._create_alert_email_html(alert_batch)
-            part2 = MIMEText(html_content, 'html')
+            msg['From'] = self._smtp_cfg[2]
+            msg['To'] = self._recipients_header
             
-            msg.attach(part1)
-            msg.attach(part2)
+            # Send email (reusing the cached connection)
+            self._send_message(msg, server)
             
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                if use_tls:
-                    server.starttls()
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
-            
-            print(f"✅ Alert email sent successfully to {len(recipients)} recipient(s)")
+            logger.info("✅ Alert email sent successfully to %d recipient(s)", len(self._recipients))
             return True
             
         except Exception as e:
-            print(f"❌ Failed to send alert email: {e}")
+            logger.error("❌ Failed to send alert email: %s", e)
             return False
     
-    def send_recovery_email(self, recovery_alert: Alert) -> bool:
+    def send_recovery_email(self, recovery_alert: Alert,
+                            on_complete: Optional[Callable[[bool], None]] = None) -> bool:
         """
-        Send recovery notification email
+        Queue recovery notification email for sending
         
         Args:
             recovery_alert: Recovery alert
+            on_complete: Called with True/False once the email was sent or failed
             
         Returns:
-            True if email sent successfully
+            True if email was queued
         """
-        if not self.config.is_enabled():
+        if not self._enabled or not self._recovery_enabled:
+            if on_complete:
+                on_complete(False)
             return False
         
-        if not self.config.get('recovery.send_email', True):
-            return False
+        return self._enqueue(self._send_recovery_email_sync, recovery_alert, on_complete)
+    
+    def _send_recovery_email_sync(self, recovery_alert: Alert) -> bool:
+        """
+        Send recovery notification email
         
+        Args:
+            recovery_alert: Recovery alert
+            
+        Returns:
+            True if email sent successfully
+        """
         try:
-            # Get email config
-            smtp_server = self.config.get('email.smtp_server')
-            smtp_port = self.config.get('email.smtp_port')
-            sender_email = self.config.get('email.sender_email')
-            sender_password = self.config.get('email.sender_password')
-            recipients = self.config.get('email.recipient_emails', [])
-            use_tls = self.config.get('email.use_tls', True)
+            # Connect first so nothing is rendered if the server is unreachable
+            server = self._get_smtp()
             
             subject = f"✅ RESOLVED: {recovery_alert.container_name} Container Recovered"
             
-            # Create email
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = sender_email
-            msg['To'] = ', '.join(recipients)
-            
-            # Plain text version
-            text_content = self._create_plain_text(recovery_alert=recovery_alert)
-            part1 = MIMEText(text_content, 'plain')
-            
             # HTML version
             html_content = self._create_recovery_email_html(recovery_alert)
-            part2 = MIMEText(html_content, 'html')
+            part2 = MIMEText(html_content, 'html', _charset=_UTF8)
             
-            msg.attach(part1)
-            msg.attach(part2)
+            if self._include_plain:
+                # Plain text version
+                text_content = self._create_plain_text(recovery_alert=recovery_alert)
+                part1 = MIMEText(text_content, 'plain', _charset=_UTF8)
+                
+                msg = MIMEMultipart('alternative')
+                msg.attach(part1)
+                msg.attach(part2)
+            else:
+                # HTML only: send the single part without a multipart wrapper
+                msg = part2
+            
+            msg['Subject'] = subject
+            msg['From'] = self._smtp_cfg[2]
+            msg['To'] = self._recipients_header
             
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                if use_tls:
-                    server.starttls()
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
+            # Send email (reusing the cached connection)
+            self._send_message(msg, server)
             
-            print(f"✅ Recovery email sent successfully to {len(recipients)} recipient(s)")
+            logger.info("✅ Recovery email sent successfully to %d recipient(s)", len(self._recipients))
             return True
             
         except Exception as e:
-            print(f"❌ Failed to send recovery email: {e}")
+            logger.error("❌ Failed to send recovery email: %s", e)
             return False
 
 
 # Global singleton
 _email_sender = None
 
+
+def reload_email_sender():
+    """Refresh cached settings on the email sender, if one was created"""
+    if _email_sender is not None:
+        _email_sender.reload()
+
+
 def get_email_sender() -> EmailSender:
     """
     Get global email sender instance
@@ -608,4 +557,7 @@ def get_email_sender() -> EmailSender:
     global _email_sender
     if _email_sender is None:
         _email_sender = EmailSender()
+        # Registered last so it runs first: drain the queue, then close
+        atexit.register(_email_sender.close)
+        atexit.register(_email_sender.flush)
     return _email_sender
\ No newline at end of file
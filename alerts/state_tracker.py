@@ -2,14 +2,41 @@
 State Tracker - Monitors container states and detects alert conditions
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import deque
 
 
 class ContainerState:
     """Represents the state of a single container"""
     
+    __slots__ = (
+        'container_id', 'container_name',
+        'cpu_history', 'ram_history',
+        '_cpu_threshold', '_ram_threshold', '_cpu_above_count', '_ram_above_count',
+        'current_health', 'previous_health',
+        'cpu_alert_active', 'ram_alert_active', 'health_alert_active',
+        'last_cpu_alert', 'last_ram_alert', 'last_health_alert', 'last_recovery_alert',
+        'last_update', 'unhealthy_since'
+    )
+    
+    # Alert type -> attribute holding last alert time / active flag
+    _LAST_ATTR = {
+        'cpu': 'last_cpu_alert',
+        'ram': 'last_ram_alert',
+        'health': 'last_health_alert',
+        'recovery': 'last_recovery_alert'
+    }
+    _ACTIVE_ATTR = {
+        'cpu': 'cpu_alert_active',
+        'ram': 'ram_alert_active',
+        'health': 'health_alert_active'
+    }
+    
+    # Previous health states from which "unhealthy" counts as a transition
+    _UNHEALTHY_PREV = frozenset({"healthy", "starting"})
+    
     def __init__(self, container_id: str, container_name: str, buffer_size: int = 3):
         """
         Initialize container state
@@ -26,6 +53,12 @@ class ContainerState:
         self.cpu_history = deque(maxlen=buffer_size)
         self.ram_history = deque(maxlen=buffer_size)
         
+        # Sliding-window counts of readings at/above the last checked threshold
+        self._cpu_threshold = None
+        self._ram_threshold = None
+        self._cpu_above_count = 0
+        self._ram_above_count = 0
+        
         # Health status tracking
         self.current_health = "unknown"
         self.previous_health = "unknown"
@@ -35,41 +68,60 @@ class ContainerState:
         self.ram_alert_active = False
         self.health_alert_active = False
         
-        # Cooldown tracking
+        # Cooldown tracking (time.monotonic() seconds)
         self.last_cpu_alert = None
         self.last_ram_alert = None
         self.last_health_alert = None
         self.last_recovery_alert = None
         
-        # Timestamps
+        # Timestamps (time.monotonic() seconds)
         self.last_update = None
         self.unhealthy_since = None
     
-    def update_stats(self, cpu_percent: float, ram_percent: float):
+    def update_stats(self, cpu_percent: float, ram_percent: float, now: Optional[float] = None):
         """
         Update container stats
         
         Args:
             cpu_percent: Current CPU usage percentage
             ram_percent: Current RAM usage percentage
+            now: time.monotonic() timestamp of the reading (defaults to current time)
         """
-        self.cpu_history.append(cpu_percent)
-        self.ram_history.append(ram_percent)
-        self.last_update = datetime.now()
+        cpu_history = self.cpu_history
+        cpu_threshold = self._cpu_threshold
+        if cpu_threshold is not None:
+            # Drop the reading about to be evicted, count the new one
+            if len(cpu_history) == cpu_history.maxlen and cpu_history[0] >= cpu_threshold:
+                self._cpu_above_count -= 1
+            if cpu_percent >= cpu_threshold:
+                self._cpu_above_count += 1
+        cpu_history.append(cpu_percent)
+        
+        ram_history = self.ram_history
+        ram_threshold = self._ram_threshold
+        if ram_threshold is not None:
+            if len(ram_history) == ram_history.maxlen and ram_history[0] >= ram_threshold:
+                self._ram_above_count -= 1
+            if ram_percent >= ram_threshold:
+                self._ram_above_count += 1
+        ram_history.append(ram_percent)
+        
+        self.last_update = now if now is not None else time.monotonic()
     
-    def update_health(self, health_status: str):
+    def update_health(self, health_status: str, now: Optional[float] = None):
         """
         Update container health status
         
         Args:
             health_status: Current health status (healthy, unhealthy, starting, none)
+            now: time.monotonic() timestamp of the reading (defaults to current time)
         """
         self.previous_health = self.current_health
         self.current_health = health_status
         
         # Track when container became unhealthy
         if health_status == "unhealthy" and self.previous_health != "unhealthy":
-            self.unhealthy_since = datetime.now()
+            self.unhealthy_since = now if now is not None else time.monotonic()
         elif health_status == "healthy":
             self.unhealthy_since = None
     
@@ -81,7 +133,7 @@ class ContainerState:
     def is_unhealthy_transition(self) -> bool:
         """Check if container transitioned to unhealthy"""
         return (self.current_health == "unhealthy" and 
-                self.previous_health in ["healthy", "starting"])
+                self.previous_health in self._UNHEALTHY_PREV)
     
     def is_recovery_transition(self) -> bool:
         """Check if container recovered (unhealthy -> healthy)"""
@@ -91,7 +143,7 @@ class ContainerState:
     def get_downtime_duration(self) -> Optional[timedelta]:
         """Get duration of unhealthy state (if recovering)"""
         if self.is_recovery_transition() and self.unhealthy_since:
-            return datetime.now() - self.unhealthy_since
+            return timedelta(seconds=time.monotonic() - self.unhealthy_since)
         return None
     
     def check_sustained_high_cpu(self, threshold: float) -> bool:
@@ -104,10 +156,13 @@ class ContainerState:
         Returns:
             True if all readings in buffer are above threshold
         """
-        if len(self.cpu_history) < self.cpu_history.maxlen:
-            return False  # Not enough data yet
+        if threshold != self._cpu_threshold:
+            # Threshold changed (or first check): recount once
+            self._cpu_threshold = threshold
+            self._cpu_above_count = sum(1 for cpu in self.cpu_history if cpu >= threshold)
         
-        return all(cpu >= threshold for cpu in self.cpu_history)
+        # A full count implies a full buffer (not enough data yet -> False)
+        return self._cpu_above_count == self.cpu_history.maxlen
     
     def check_sustained_high_ram(self, threshold: float) -> bool:
         """
@@ -119,10 +174,13 @@ class ContainerState:
         Returns:
             True if all readings in buffer are above threshold
         """
-        if len(self.ram_history) < self.ram_history.maxlen:
-            return False  # Not enough data yet
+        if threshold != self._ram_threshold:
+            # Threshold changed (or first check): recount once
+            self._ram_threshold = threshold
+            self._ram_above_count = sum(1 for ram in self.ram_history if ram >= threshold)
         
-        return all(ram >= threshold for ram in self.ram_history)
+        # A full count implies a full buffer (not enough data yet -> False)
+        return self._ram_above_count == self.ram_history.maxlen
     
     def get_cpu_history_list(self) -> List[float]:
         """Get CPU history as list"""
@@ -132,6 +190,14 @@ class ContainerState:
         """Get RAM history as list"""
         return list(self.ram_history)
     
+    def get_cpu_history(self) -> Tuple[float, ...]:
+        """Get CPU history as immutable snapshot"""
+        return tuple(self.cpu_history)
+    
+    def get_ram_history(self) -> Tuple[float, ...]:
+        """Get RAM history as immutable snapshot"""
+        return tuple(self.ram_history)
+    
     def get_current_cpu(self) -> Optional[float]:
         """Get most recent CPU reading"""
         return self.cpu_history[-1] if self.cpu_history else None
@@ -151,22 +217,13 @@ class ContainerState:
         Returns:
             True if in cooldown period
         """
-        last_alert_time = None
-        
-        if alert_type == 'cpu':
-            last_alert_time = self.last_cpu_alert
-        elif alert_type == 'ram':
-            last_alert_time = self.last_ram_alert
-        elif alert_type == 'health':
-            last_alert_time = self.last_health_alert
-        elif alert_type == 'recovery':
-            last_alert_time = self.last_recovery_alert
+        attr = self._LAST_ATTR.get(alert_type)
+        last_alert_time = getattr(self, attr) if attr else None
         
         if last_alert_time is None:
             return False
         
-        time_since_alert = datetime.now() - last_alert_time
-        return time_since_alert < timedelta(minutes=cooldown_minutes)
+        return time.monotonic() - last_alert_time < cooldown_minutes * 60.0
     
     def set_alert_sent(self, alert_type: str):
         """
@@ -175,19 +232,13 @@ class ContainerState:
         Args:
             alert_type: Type of alert ('cpu', 'ram', 'health', 'recovery')
         """
-        now = datetime.now()
+        attr = self._LAST_ATTR.get(alert_type)
+        if attr:
+            setattr(self, attr, time.monotonic())
         
-        if alert_type == 'cpu':
-            self.last_cpu_alert = now
-            self.cpu_alert_active = True
-        elif alert_type == 'ram':
-            self.last_ram_alert = now
-            self.ram_alert_active = True
-        elif alert_type == 'health':
-            self.last_health_alert = now
-            self.health_alert_active = True
-        elif alert_type == 'recovery':
-            self.last_recovery_alert = now
+        active_attr = self._ACTIVE_ATTR.get(alert_type)
+        if active_attr:
+            setattr(self, active_attr, True)
     
     def clear_alert(self, alert_type: str):
         """
@@ -196,12 +247,9 @@ class ContainerState:
         Args:
             alert_type: Type of alert ('cpu', 'ram', 'health')
         """
-        if alert_type == 'cpu':
-            self.cpu_alert_active = False
-        elif alert_type == 'ram':
-            self.ram_alert_active = False
-        elif alert_type == 'health':
-            self.health_alert_active = False
+        active_attr = self._ACTIVE_ATTR.get(alert_type)
+        if active_attr:
+            setattr(self, active_attr, False)
 
 
 class StateTracker:
@@ -250,8 +298,9 @@ class StateTracker:
             health_status: Health status (healthy, unhealthy, starting, none)
         """
         state = self.get_or_create_state(container_id, container_name)
-        state.update_stats(cpu_percent, ram_percent)
-        state.update_health(health_status)
+        now = time.monotonic()
+        state.update_stats(cpu_percent, ram_percent, now)
+        state.update_health(health_status, now)
     
     def get_state(self, container_id: str) -> Optional[ContainerState]:
         """
@@ -269,18 +318,18 @@ class StateTracker:
         """Get all container states"""
         return self.containers
     
-    def cleanup_stale_containers(self, active_container_ids: List[str]):
+    def cleanup_stale_containers(self, active_container_ids: Iterable[str]):
         """
         Remove containers that are no longer active
         
         Args:
-            active_container_ids: List of currently active container IDs
+            active_container_ids: Currently active container IDs (set preferred)
         """
-        # Find containers to remove (not in active list)
-        to_remove = [
-            cid for cid in self.containers.keys() 
-            if cid not in active_container_ids
-        ]
+        if not isinstance(active_container_ids, (set, frozenset)):
+            active_container_ids = set(active_container_ids)
+        
+        # Find containers to remove (not in active set)
+        to_remove = self.containers.keys() - active_container_ids
         
         for cid in to_remove:
             del self.containers[cid]
@@ -314,8 +363,8 @@ class StateTracker:
                 state.clear_alert('ram')
 
 
-# Global singleton instance
-_state_tracker = None
+# Global singleton instance (created at import: cheap, and no first-access race)
+_state_tracker = StateTracker()
 
 def get_state_tracker() -> StateTracker:
     """
@@ -324,7 +373,4 @@ def get_state_tracker() -> StateTracker:
     Returns:
         StateTracker instance
     """
-    global _state_tracker
-    if _state_tracker is None:
-        _state_tracker = StateTracker()
     return _state_tracker
\ No newline at end of file
@@ -1,16 +1,31 @@
 from flask import Flask, render_template, jsonify
+from flask.json.provider import DefaultJSONProvider
 import docker
+import functools
+import json
 from docker.errors import DockerException
+from docker.types import CancellableStream
 import psutil
 from datetime import datetime, timedelta
 import threading
+import logging
 import time
 import sqlite3
 import os
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+# Verbose per-item logging (e.g. network listing details), off by default
+DEBUG = os.getenv('DW_DEBUG', 'false').lower() == 'true'
+if DEBUG:
+    logger.setLevel(logging.DEBUG)
 
 # Import alert system
 try:
-    from alerts import get_alert_manager, get_email_sender, get_config as get_alert_config
+    from alerts import get_alert_manager, get_email_sender, get_config as get_alert_config, ContainerSample
     ALERTS_ENABLED = True
     print("✅ Alert system loaded successfully")
 except ImportError as e:
@@ -20,49 +35,246 @@ except Exception as e:
     ALERTS_ENABLED = False
     print(f"⚠️  Alert system configuration error: {e}")
 
+# Optional fast JSON serializer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider serializing with orjson (falls back to stdlib for unsupported types)"""
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+    
+    def _dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Initialize Docker client
+# Keep-alive pool sized for the stats executor plus request/collector threads
+DOCKER_POOL_SIZE = 32
 try:
-    client = docker.from_env()
+    client = docker.from_env(max_pool_size=DOCKER_POOL_SIZE)
 except DockerException as e:
     print(f"Docker connection error: {e}")
     client = None
 
+# Every container state other than running (status filter values are OR'ed)
+STOPPED_STATUSES = ['created', 'restarting', 'removing', 'paused', 'exited', 'dead']
+
+# Upper bound on log bytes returned by /api/container/<id>/logs
+LOGS_MAX_BYTES = 64 * 1024
+
+# Worker pool for concurrent per-container Docker requests (I/O bound)
+stats_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='stats')
+
+# Collection period and the longest the collector waits for one cycle's stats requests
+COLLECT_INTERVAL = 60  # seconds
+STATS_FETCH_TIMEOUT = 30  # seconds
+
 # Database path
 DB_PATH = os.getenv('DB_PATH', os.path.join(os.path.dirname(__file__), 'data', 'docker_stats.db'))
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-# Dictionary to store last cumulative values for each container
-# Format: {container_id: {'timestamp': datetime, 'net_in': bytes, 'net_out': bytes, 'disk_read': bytes, 'disk_write': bytes}}
+# Bytes per MB, for MB and MB/s conversions
+_MB = 1048576.0
+
+
+class _RateState:
+    """
+    Last cumulative counters of one container and when they were read (time.time())
+    
+    I/O counters are in bytes, CPU counters in nanoseconds. Never modified
+    once stored in last_cumulative_values (a new state replaces it).
+    """
+    __slots__ = ('timestamp', 'net_in', 'net_out', 'disk_read', 'disk_write', 'cpu_total', 'cpu_system')
+    
+    def __init__(self, timestamp, net_in, net_out, disk_read, disk_write, cpu_total, cpu_system):
+        self.timestamp = timestamp
+        self.net_in = net_in
+        self.net_out = net_out
+        self.disk_read = disk_read
+        self.disk_write = disk_write
+        self.cpu_total = cpu_total
+        self.cpu_system = cpu_system
+
+
+# Last cumulative values for each container
+# Format: {container_id: _RateState}
 last_cumulative_values = {}
 
+# Lifetime of cached Docker listings, shared by concurrent requests
+DOCKER_CACHE_TTL = 1.5  # seconds
+
+# Lifetime of cached networks, volumes and the network -> containers index
+# (also dropped on the matching Docker events)
+RESOURCE_CACHE_TTL = 5.0  # seconds
+
+# Latest host CPU/RAM sample, refreshed by the system sampler thread
+SYSTEM_SAMPLE_INTERVAL = 1.0  # seconds
+_latest_system = None
+
 
 # ===== DATABASE FUNCTIONS =====
 
+# One SQLite connection per thread, reused across calls (connections are not
+# shared between threads)
+_db_local = threading.local()
+
+# Statements on the hot paths, kept as module constants so every call passes
+# the same string and hits the connection's prepared statement cache (SQL
+# rebuilt per call, e.g. with f-strings, would be re-parsed every time)
+SQL_CACHED_STATEMENTS = 256
+
+_SQL_INSERT_STATS = '''
+    INSERT OR IGNORE INTO container_stats 
+    (container_id, container_name, timestamp, cpu_percent, mem_usage_mb, 
+     mem_limit_mb, mem_percent, net_input_mb, net_output_mb, 
+     disk_read_mb, disk_write_mb)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_ALERT = '''
+    INSERT INTO alert_history
+    (batch_id, container_id, container_name, alert_type, priority, 
+     value, timestamp, email_sent, cooldown_until)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Column order of _SQL_SELECT_HISTORY rows (history API returns this columnar layout,
+# timestamp in unix seconds)
+HISTORY_COLUMNS = [
+    'timestamp', 'cpu_percent', 'mem_usage_mb', 'mem_limit_mb', 'mem_percent',
+    'net_input_mb', 'net_output_mb', 'disk_read_mb', 'disk_write_mb'
+]
+
+_SQL_SELECT_HISTORY = '''
+    SELECT timestamp, cpu_percent, mem_usage_mb, mem_limit_mb, mem_percent,
+           net_input_mb, net_output_mb, disk_read_mb, disk_write_mb
+    FROM container_stats
+    WHERE container_id = ? AND timestamp >= ?
+    ORDER BY timestamp ASC
+'''
+
+# Old stats are deleted in chunks so the write lock is released between them
+CLEANUP_BATCH_SIZE = 10000
+
+# Retention cleanup runs on its own thread at this interval, not every collection cycle
+CLEANUP_INTERVAL = 3600  # seconds
+
+_SQL_DELETE_OLD = '''
+    DELETE FROM container_stats
+    WHERE rowid IN (
+        SELECT rowid FROM container_stats
+        WHERE timestamp < ?
+        LIMIT ?
+    )
+'''
+
+_SQL_DELETE_OLD_ALERTS = '''
+    DELETE FROM alert_history
+    WHERE timestamp < ?
+'''
+
+
+def get_conn():
+    """
+    Get this thread's SQLite connection, opening and tuning it on first use
+    
+    Returns:
+        sqlite3.Connection
+    """
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, cached_statements=SQL_CACHED_STATEMENTS)
+        # WAL lets history readers run while the collector writes;
+        # NORMAL sync only fsyncs at checkpoints in WAL mode
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA busy_timeout=5000')
+        _db_local.conn = conn
+    return conn
+
+
+_SQL_CREATE_STATS = '''
+    CREATE TABLE IF NOT EXISTS container_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        container_id TEXT NOT NULL,
+        container_name TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,  -- unix seconds
+        cpu_percent REAL,
+        mem_usage_mb REAL,
+        mem_limit_mb REAL,
+        mem_percent REAL,
+        net_input_mb REAL,     -- MB/s rate
+        net_output_mb REAL,    -- MB/s rate
+        disk_read_mb REAL,     -- MB/s rate
+        disk_write_mb REAL,    -- MB/s rate
+        UNIQUE(container_id, timestamp)
+    )
+'''
+
+
+def _migrate_stats_timestamps(conn):
+    """
+    Rebuild container_stats from the old schema, storing ISO timestamps as
+    INTEGER unix seconds (old values were written in local time)
+    
+    Args:
+        conn: SQLite connection
+    """
+    print("🔄 Migrating container_stats timestamps to unix seconds...")
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('ALTER TABLE container_stats RENAME TO container_stats_old')
+        conn.execute(_SQL_CREATE_STATS)
+        conn.execute('''
+            INSERT OR IGNORE INTO container_stats 
+            (container_id, container_name, timestamp, cpu_percent, mem_usage_mb, 
+             mem_limit_mb, mem_percent, net_input_mb, net_output_mb, 
+             disk_read_mb, disk_write_mb)
+            SELECT container_id, container_name,
+                   CAST(strftime('%s', timestamp, 'utc') AS INTEGER),
+                   cpu_percent, mem_usage_mb, mem_limit_mb, mem_percent,
+                   net_input_mb, net_output_mb, disk_read_mb, disk_write_mb
+            FROM container_stats_old
+            WHERE strftime('%s', timestamp, 'utc') IS NOT NULL
+        ''')
+        # Dropping the old table also drops its indexes, recreated by init_database
+        conn.execute('DROP TABLE container_stats_old')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    print("✅ container_stats migrated")
+
+
 def init_database():
     """Initialize SQLite database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
-    # Container stats table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS container_stats (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            container_id TEXT NOT NULL,
-            container_name TEXT NOT NULL,
-            timestamp DATETIME NOT NULL,
-            cpu_percent REAL,
-            mem_usage_mb REAL,
-            mem_limit_mb REAL,
-            mem_percent REAL,
-            net_input_mb REAL,     -- MB/s rate
-            net_output_mb REAL,    -- MB/s rate
-            disk_read_mb REAL,     -- MB/s rate
-            disk_write_mb REAL,    -- MB/s rate
-            UNIQUE(container_id, timestamp)
-        )
-    ''')
+    # Container stats table (databases from older versions stored ISO text timestamps)
+    cursor.execute("SELECT type FROM pragma_table_info('container_stats') WHERE name = 'timestamp'")
+    column = cursor.fetchone()
+    if column is not None and column[0].upper() != 'INTEGER':
+        _migrate_stats_timestamps(conn)
+    cursor.execute(_SQL_CREATE_STATS)
     
     # Alert history table
     cursor.execute('''
@@ -86,6 +298,12 @@ def init_database():
         ON container_stats(container_id, timestamp DESC)
     ''')
     
+    # Bare timestamp index for the cleanup range delete
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_stats_timestamp 
+        ON container_stats(timestamp)
+    ''')
+    
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_alert_timestamp 
         ON alert_history(timestamp DESC)
@@ -97,38 +315,51 @@ def init_database():
     ''')
     
     conn.commit()
-    conn.close()
     print("✅ Database initialized")
 
 
+def _stats_row(container_id, container_name, timestamp, stats_data):
+    """Build the container_stats parameter tuple for one sample (timestamp in unix seconds)"""
+    return (
+        container_id,
+        container_name,
+        timestamp,
+        stats_data['cpu_percent'],
+        stats_data['mem_usage_mb'],
+        stats_data['mem_limit_mb'],
+        stats_data['mem_percent'],
+        stats_data['net_input_mb'],
+        stats_data['net_output_mb'],
+        stats_data['disk_read_mb'],
+        stats_data['disk_write_mb']
+    )
+
+
+def save_container_stats_batch(rows):
+    """
+    Save many statistics rows in a single transaction (one commit for the batch)
+    
+    Args:
+        rows: Parameter tuples built with _stats_row()
+    """
+    if not rows:
+        return
+    
+    conn = get_conn()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(_SQL_INSERT_STATS, rows)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error saving stats: {e}")
+
+
 def save_container_stats(container_id, container_name, stats_data):
     """Save statistics to database"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO container_stats 
-            (container_id, container_name, timestamp, cpu_percent, mem_usage_mb, 
-             mem_limit_mb, mem_percent, net_input_mb, net_output_mb, 
-             disk_read_mb, disk_write_mb)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            container_id,
-            container_name,
-            stats_data['timestamp'],
-            stats_data['cpu_percent'],
-            stats_data['mem_usage_mb'],
-            stats_data['mem_limit_mb'],
-            stats_data['mem_percent'],
-            stats_data['net_input_mb'],
-            stats_data['net_output_mb'],
-            stats_data['disk_read_mb'],
-            stats_data['disk_write_mb']
-        ))
-        
-        conn.commit()
-        conn.close()
+        timestamp = int(datetime.fromisoformat(stats_data['timestamp']).timestamp())
+        save_container_stats_batch([_stats_row(container_id, container_name, timestamp, stats_data)])
     except Exception as e:
         print(f"❌ Error saving stats: {e}")
 
@@ -143,7 +374,7 @@ def save_alert_to_database(alert, batch_id, email_sent):
         email_sent: Whether email was sent successfully
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_conn()
         cursor = conn.cursor()
         
         # Calculate cooldown_until based on alert config
@@ -160,12 +391,7 @@ def save_alert_to_database(alert, batch_id, email_sent):
         
         cooldown_until = (datetime.now() + timedelta(minutes=cooldown_minutes)).isoformat()
         
-        cursor.execute('''
-            INSERT INTO alert_history
-            (batch_id, container_id, container_name, alert_type, priority, 
-             value, timestamp, email_sent, cooldown_until)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(_SQL_INSERT_ALERT, (
             batch_id,
             alert.container_id,
             alert.container_name,
@@ -178,78 +404,87 @@ def save_alert_to_database(alert, batch_id, email_sent):
         ))
         
         conn.commit()
-        conn.close()
     except Exception as e:
         print(f"❌ Error saving alert to database: {e}")
 
 
+def _on_recovery_email_sent(recovery_alert, email_sent):
+    """Record a recovery alert once its email has been processed"""
+    batch_id = f"recovery_{recovery_alert.timestamp.isoformat()}"
+    save_alert_to_database(recovery_alert, batch_id, email_sent)
+    
+    if email_sent:
+        print(f"   ✅ Recovery email sent for {recovery_alert.container_name}")
+
+
+def _on_alert_email_sent(alert_batch, email_sent):
+    """Record all alerts of a batch once the aggregate email has been processed"""
+    batch_id = f"batch_{alert_batch.timestamp.isoformat()}"
+    for alert in alert_batch.critical_alerts + alert_batch.warning_alerts:
+        save_alert_to_database(alert, batch_id, email_sent)
+    
+    if email_sent:
+        critical_count = len(alert_batch.critical_alerts)
+        warning_count = len(alert_batch.warning_alerts)
+        print(f"   ✅ Alert email sent: {critical_count} critical, {warning_count} warning")
+
+
 def get_container_stats_history(container_id, days=7):
-    """Retrieve statistics history for a container"""
+    """
+    Retrieve statistics history for a container
+    
+    Args:
+        container_id: Container short ID
+        days: How many days back to return
+    
+    Returns:
+        Dict with 'columns' (HISTORY_COLUMNS) and 'rows' (one list of values per sample)
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_conn()
         cursor = conn.cursor()
         
-        # Calculate limit date (7 days ago)
-        limit_date = (datetime.now() - timedelta(days=days)).isoformat()
+        # Calculate limit date (7 days ago) in unix seconds
+        limit_ts = int(time.time()) - days * 86400
         
-        cursor.execute('''
-            SELECT timestamp, cpu_percent, mem_usage_mb, mem_limit_mb, mem_percent,
-                   net_input_mb, net_output_mb, disk_read_mb, disk_write_mb
-            FROM container_stats
-            WHERE container_id = ? AND timestamp >= ?
-            ORDER BY timestamp ASC
-        ''', (container_id, limit_date))
+        cursor.execute(_SQL_SELECT_HISTORY, (container_id, limit_ts))
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        # Convert to list of dicts
-        history = []
-        for row in rows:
-            history.append({
-                'timestamp': row[0],
-                'cpu_percent': row[1],
-                'mem_usage_mb': row[2],
-                'mem_limit_mb': row[3],
-                'mem_percent': row[4],
-                'net_input_mb': row[5],
-                'net_output_mb': row[6],
-                'disk_read_mb': row[7],
-                'disk_write_mb': row[8]
-            })
-        
-        return history
+        # Columnar layout: key names are sent once instead of once per sample
+        return {'columns': HISTORY_COLUMNS, 'rows': cursor.fetchall()}
     except Exception as e:
         print(f"❌ Error retrieving history: {e}")
-        return []
+        return {'columns': HISTORY_COLUMNS, 'rows': []}
 
 
 def cleanup_old_stats():
     """Remove statistics older than 7 days"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_conn()
         cursor = conn.cursor()
         
-        # Limit date (7 days ago)
-        limit_date = (datetime.now() - timedelta(days=7)).isoformat()
+        # Limit date (7 days ago), stats timestamps are unix seconds
+        limit_ts = int(time.time()) - 7 * 86400
         
-        # Clean container stats
-        cursor.execute('''
-            DELETE FROM container_stats
-            WHERE timestamp < ?
-        ''', (limit_date,))
-        stats_deleted = cursor.rowcount
+        # Clean container stats, one short transaction per chunk
+        stats_deleted = 0
+        while True:
+            cursor.execute(_SQL_DELETE_OLD, (limit_ts, CLEANUP_BATCH_SIZE))
+            deleted = cursor.rowcount
+            conn.commit()
+            stats_deleted += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
         
         # Clean alert history (keep 30 days)
         alert_limit_date = (datetime.now() - timedelta(days=30)).isoformat()
-        cursor.execute('''
-            DELETE FROM alert_history
-            WHERE timestamp < ?
-        ''', (alert_limit_date,))
+        cursor.execute(_SQL_DELETE_OLD_ALERTS, (alert_limit_date,))
         alerts_deleted = cursor.rowcount
         
         conn.commit()
-        conn.close()
+        
+        # Large deletes grow the WAL file; checkpoint and truncate it
+        if stats_deleted >= CLEANUP_BATCH_SIZE:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
         
         if stats_deleted > 0:
             print(f"🧹 Cleaned {stats_deleted} old stats records from database")
@@ -259,96 +494,185 @@ def cleanup_old_stats():
         print(f"❌ Error cleaning database: {e}")
 
 
+def cleanup_background():
+    """Run cleanup_old_stats at startup and then every CLEANUP_INTERVAL seconds"""
+    while True:
+        cleanup_old_stats()
+        time.sleep(CLEANUP_INTERVAL)
+
+
 # Initialize database on startup
 init_database()
 
 
+# Result of calculate_rate while there is no usable previous sample
+_ZERO_RATES = {
+    'net_input_mb_s': 0.0,
+    'net_output_mb_s': 0.0,
+    'disk_read_mb_s': 0.0,
+    'disk_write_mb_s': 0.0,
+    'cpu_percent': 0.0
+}
+
+
 def calculate_rate(container_id, current_cumulative_values, current_timestamp):
     """
-    Calculate rates (MB/s) for Network and Disk I/O by comparing with previous values.
+    Calculate CPU% and Network/Disk I/O rates (MB/s) by comparing with previous values.
     
     Args:
         container_id: Container ID
-        current_cumulative_values: Dict with current cumulative values in bytes
-                                   {'net_in': bytes, 'net_out': bytes, 'disk_read': bytes, 'disk_write': bytes}
-        current_timestamp: Current timestamp (datetime)
+        current_cumulative_values: Dict with current cumulative values
+                                   {'net_in': bytes, 'net_out': bytes, 'disk_read': bytes, 'disk_write': bytes,
+                                    'cpu_total': ns, 'cpu_system': ns, 'online_cpus': int}
+        current_timestamp: Current time.time() value (seconds)
     
     Returns:
-        Dict with rates in MB/s: {'net_input_mb_s': float, 'net_output_mb_s': float, 
-                                   'disk_read_mb_s': float, 'disk_write_mb_s': float}
+        Dict with rates in MB/s and CPU%: {'net_input_mb_s': float, 'net_output_mb_s': float, 
+                                   'disk_read_mb_s': float, 'disk_write_mb_s': float,
+                                   'cpu_percent': float}
     """
-    global last_cumulative_values
+    net_in = current_cumulative_values['net_in']
+    net_out = current_cumulative_values['net_out']
+    disk_read = current_cumulative_values['disk_read']
+    disk_write = current_cumulative_values['disk_write']
+    cpu_total = current_cumulative_values['cpu_total']
+    cpu_system = current_cumulative_values['cpu_system']
     
-    # If we don't have previous values for this container, save these and return 0
-    if container_id not in last_cumulative_values:
-        last_cumulative_values[container_id] = {
-            'timestamp': current_timestamp,
-            'net_in': current_cumulative_values['net_in'],
-            'net_out': current_cumulative_values['net_out'],
-            'disk_read': current_cumulative_values['disk_read'],
-            'disk_write': current_cumulative_values['disk_write']
-        }
-        return {
-            'net_input_mb_s': 0.0,
-            'net_output_mb_s': 0.0,
-            'disk_read_mb_s': 0.0,
-            'disk_write_mb_s': 0.0
-        }
+    last = last_cumulative_values.get(container_id)
     
-    # Retrieve previous values
-    last_values = last_cumulative_values[container_id]
+    # If we don't have previous values for this container, save these and return 0
+    if last is None:
+        last_cumulative_values[container_id] = _RateState(
+            current_timestamp, net_in, net_out, disk_read, disk_write, cpu_total, cpu_system
+        )
+        return dict(_ZERO_RATES)
     
     # Calculate elapsed time in seconds
-    time_delta = (current_timestamp - last_values['timestamp']).total_seconds()
+    time_delta = current_timestamp - last.timestamp
     
     # If elapsed time is too small, return 0 to avoid divisions by very small numbers
     if time_delta < 0.1:
-        return {
-            'net_input_mb_s': 0.0,
-            'net_output_mb_s': 0.0,
-            'disk_read_mb_s': 0.0,
-            'disk_write_mb_s': 0.0
-        }
+        return dict(_ZERO_RATES)
+    
+    # Calculate differences in bytes; if a cumulative value went backwards
+    # (container restart), use the current value directly as difference
+    prev = last.net_in
+    net_in_diff = net_in - prev if net_in >= prev else net_in
+    prev = last.net_out
+    net_out_diff = net_out - prev if net_out >= prev else net_out
+    prev = last.disk_read
+    disk_read_diff = disk_read - prev if disk_read >= prev else disk_read
+    prev = last.disk_write
+    disk_write_diff = disk_write - prev if disk_write >= prev else disk_write
+    
     
-    # Calculate differences in bytes
-    net_in_diff = current_cumulative_values['net_in'] - last_values['net_in']
-    net_out_diff = current_cumulative_values['net_out'] - last_values['net_out']
-    disk_read_diff = current_cumulative_values['disk_read'] - last_values['disk_read']
-    disk_write_diff = current_cumulative_values['disk_write'] - last_values['disk_write']
-    
-    # Handle case where cumulative values reset (container restart)
-    # In this case, use current values directly as difference
-    if net_in_diff < 0:
-        net_in_diff = current_cumulative_values['net_in']
-    if net_out_diff < 0:
-        net_out_diff = current_cumulative_values['net_out']
-    if disk_read_diff < 0:
-        disk_read_diff = current_cumulative_values['disk_read']
-    if disk_write_diff < 0:
-        disk_write_diff = current_cumulative_values['disk_write']
-    
-    # Calculate rates in MB/s
+    # CPU% is the container's share of host CPU time over the same interval
+    # (container counter resets on restart like the I/O ones)
+    prev = last.cpu_total
+    cpu_delta = cpu_total - prev if cpu_total >= prev else cpu_total
+    system_delta = cpu_system - last.cpu_system
+    cpu_percent = 0.0
+    if system_delta > 0 and cpu_delta > 0:
+        cpu_percent = (cpu_delta / system_delta) * current_cumulative_values['online_cpus'] * 100.0
+    
+    # Calculate rates in MB/s (one division shared by all four)
+    inv = 1.0 / (time_delta * _MB)
     rates = {
-        'net_input_mb_s': (net_in_diff / (1024 * 1024)) / time_delta,
-        'net_output_mb_s': (net_out_diff / (1024 * 1024)) / time_delta,
-        'disk_read_mb_s': (disk_read_diff / (1024 * 1024)) / time_delta,
-        'disk_write_mb_s': (disk_write_diff / (1024 * 1024)) / time_delta
+        'net_input_mb_s': net_in_diff * inv,
+        'net_output_mb_s': net_out_diff * inv,
+        'disk_read_mb_s': disk_read_diff * inv,
+        'disk_write_mb_s': disk_write_diff * inv,
+        'cpu_percent': cpu_percent
     }
     
-    # Update previous values with current ones
-    last_cumulative_values[container_id] = {
-        'timestamp': current_timestamp,
-        'net_in': current_cumulative_values['net_in'],
-        'net_out': current_cumulative_values['net_out'],
-        'disk_read': current_cumulative_values['disk_read'],
-        'disk_write': current_cumulative_values['disk_write']
-    }
+    # Publish the current values as a new state with one assignment, so
+    # concurrent callers (request threads, collector workers) never see a
+    # timestamp and counters from different samples
+    last_cumulative_values[container_id] = _RateState(
+        current_timestamp, net_in, net_out, disk_read, disk_write, cpu_total, cpu_system
+    )
     
     return rates
 
 
+
+def _sample_system():
+    """Take one host CPU/RAM sample (CPU usage since the previous call)"""
+    ram = psutil.virtual_memory()
+    return {
+        'cpu_percent': psutil.cpu_percent(interval=None),
+        'ram_percent': ram.percent,
+        'ram_used': ram.used,
+        'ram_total': ram.total
+    }
+
+
+def sample_system_background():
+    """Refresh _latest_system every SYSTEM_SAMPLE_INTERVAL on a monotonic schedule"""
+    global _latest_system
+    next_tick = time.monotonic()
+    
+    while True:
+        # Sleep first: the import-time prime already took a sample, and
+        # cpu_percent(interval=None) right after it would cover ~0s
+        next_tick += SYSTEM_SAMPLE_INTERVAL
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Fell behind (e.g. suspended), resync instead of bursting
+            next_tick = time.monotonic()
+        
+        # Swap in a new dict so readers never see a partial sample
+        _latest_system = _sample_system()
+
+
+# First sample primes psutil's CPU counters
+_latest_system = _sample_system()
+
+
+def ttl_cache(seconds):
+    """
+    Cache a function's results for a few seconds
+    
+    Results are keyed by the call arguments and computed by one caller at a
+    time. Calls with unhashable arguments (e.g. pre-fetched container lists)
+    bypass the cache, and None results are not stored. The wrapper's
+    cache_clear() drops every entry (e.g. after a state-changing request).
+    
+    Args:
+        seconds: How long a result is reused
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[1] > time.monotonic():
+                    return entry[0]
+                
+                value = func(*args, **kwargs)
+                if value is not None:
+                    cache[key] = (value, time.monotonic() + seconds)
+                return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@ttl_cache(DOCKER_CACHE_TTL)
 def get_docker_stats():
-    """Collect general Docker statistics"""
+    """Get general Docker statistics"""
     if not client:
         return None
     
@@ -356,23 +680,22 @@ def get_docker_stats():
         # Get all images
         images = client.images.list()
         
-        # Get all containers
-        all_containers = client.containers.list(all=True)
-        running_containers = [c for c in all_containers if c.status == 'running']
-        stopped_containers = [c for c in all_containers if c.status != 'running']
+        # Count containers by state in one pass (plain summaries, no per-container inspect)
+        all_containers = client.api.containers(all=True)
+        running_count = sum(1 for c in all_containers if c['State'] == 'running')
         
-        # Get system CPU and RAM usage
-        cpu_percent = psutil.cpu_percent(interval=1)
-        ram = psutil.virtual_memory()
-        ram_percent = ram.percent
-        ram_used_gb = round(ram.used / (1024 ** 3), 2)  # Convert bytes to GB
-        ram_total_gb = round(ram.total / (1024 ** 3), 2)  # Convert bytes to GB
+        # Get system CPU and RAM usage from the latest background sample
+        system = _latest_system
+        cpu_percent = system['cpu_percent']
+        ram_percent = system['ram_percent']
+        ram_used_gb = round(system['ram_used'] / (1024 ** 3), 2)  # Convert bytes to GB
+        ram_total_gb = round(system['ram_total'] / (1024 ** 3), 2)  # Convert bytes to GB
         
         return {
             'images_count': len(images),
             'total_containers': len(all_containers),
-            'running_containers': len(running_containers),
-            'stopped_containers': len(stopped_containers),
+            'running_containers': running_count,
+            'stopped_containers': len(all_containers) - running_count,
             'cpu_usage': round(cpu_percent, 1),
             'ram_usage': round(ram_percent, 1),
             'ram_used_gb': ram_used_gb,
@@ -383,6 +706,22 @@ def get_docker_stats():
         return None
 
 
+@functools.lru_cache(maxsize=2048)
+def _format_created(created_date):
+    """Format a Docker ISO 'Created' timestamp (cached, values never change)"""
+    created_dt = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
+    return created_dt.strftime('%d/%m/%Y %H:%M')
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_started_at(started_at):
+    """Format a Docker ISO 'StartedAt' timestamp in local time (cached per raw value)"""
+    # Parse ISO date and convert to system local time
+    started_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+    return started_dt.astimezone().strftime('%d/%m/%Y %H:%M')
+
+
+@ttl_cache(DOCKER_CACHE_TTL)
 def get_images_data():
     """Get Docker images information"""
     if not client:
@@ -406,11 +745,8 @@ def get_images_data():
             # Check if image is in use
             in_use = img.id in used_images
             
-            # Image creation date
-            created_date = img.attrs['Created']
-            # Convert to readable format
-            created_dt = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-            created_str = created_dt.strftime('%d/%m/%Y %H:%M')
+            # Image creation date in readable format
+            created_str = _format_created(img.attrs['Created'])
             
             images_data.append({
                 'name': tags,
@@ -426,18 +762,51 @@ def get_images_data():
         return []
 
 
-def get_containers_data(running_only=True):
-    """Get Docker containers information"""
+@ttl_cache(DOCKER_CACHE_TTL)
+def _get_image_tags():
+    """
+    Map image IDs to their first tag, from one image listing
+    
+    Returns:
+        Dict {image_id: 'repo:tag'} (untagged images are left out)
+    """
+    image_tags = {}
+    for image in client.api.images():
+        for tag in image.get('RepoTags') or ():
+            if tag != '<none>:<none>':
+                image_tags[image['Id']] = tag
+                break
+    return image_tags
+
+
+@ttl_cache(DOCKER_CACHE_TTL)
+def get_containers_data(running_only=True, containers=None):
+    """
+    Get Docker containers information
+    
+    Args:
+        running_only: Only list running containers (ignored if containers is given)
+        containers: Pre-fetched container summaries from client.api.containers()
+    
+    Returns:
+        List of container dicts for the dashboard
+    """
     if not client:
         return []
     
     try:
-        containers = client.containers.list(all=not running_only)
+        if containers is None:
+            containers = client.api.containers(all=not running_only)
         containers_data = []
         
-        for container in containers:
+        # Start time, health and port mappings are only in the inspect data;
+        # inspect all containers concurrently instead of one round trip at a time
+        inspected = stats_executor.map(client.api.inspect_container, [c['Id'] for c in containers])
+        image_tags = _get_image_tags()
+        
+        for summary, attrs in zip(containers, inspected):
             # Get port information
-            ports = container.attrs['NetworkSettings']['Ports']
+            ports = attrs['NetworkSettings']['Ports']
             port_mappings = []
             
             if ports:
@@ -450,23 +819,20 @@ def get_containers_data(running_only=True):
             # If no ports are mapped, show N/A instead of a long message
             ports_str = ', '.join(port_mappings) if port_mappings else 'N/A'
             
-            # Get image name
-            image_name = container.image.tags[0] if container.image.tags else 'unknown'
+            # Get image name (first tag of the image, like container.image.tags)
+            image_name = image_tags.get(summary.get('ImageID'), 'unknown')
             
             # Get start/restart date in LOCAL TIME
-            started_at = container.attrs['State']['StartedAt']
-            # Parse ISO date
-            started_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-            # Convert to system local time
-            started_local = started_dt.astimezone()
-            started_str = started_local.strftime('%d/%m/%Y %H:%M')
+            state = attrs['State']
+            started_str = _format_started_at(state['StartedAt'])
             
             # Get health status
             health_status = 'none'
             health_class = 'none'
             
-            if 'Health' in container.attrs['State']:
-                health_status = container.attrs['State']['Health']['Status']
+            health = state.get('Health')
+            if health is not None:
+                health_status = health['Status']
                 if health_status == 'healthy':
                     health_class = 'healthy'
                 elif health_status == 'unhealthy':
@@ -475,10 +841,10 @@ def get_containers_data(running_only=True):
                     health_class = 'starting'
             
             containers_data.append({
-                'name': container.name,
+                'name': attrs['Name'].lstrip('/'),
                 'image': image_name,
-                'id': container.short_id,
-                'status': container.status,
+                'id': summary['Id'][:12],
+                'status': state['Status'],
                 'ports': ports_str,
                 'started_at': started_str,
                 'health_status': health_status,
@@ -491,6 +857,68 @@ def get_containers_data(running_only=True):
         return []
 
 
+@ttl_cache(DOCKER_CACHE_TTL)
+def get_containers_data_split():
+    """
+    Get running and non-running containers from a single listing
+    
+    All containers are listed and inspected in one batch, then partitioned.
+    
+    Returns:
+        Tuple of (running container dicts, stopped container dicts)
+    """
+    if not client:
+        return [], []
+    
+    try:
+        summaries = client.api.containers(all=True)
+    except Exception as e:
+        print(f"Error retrieving containers: {e}")
+        return [], []
+    
+    running = []
+    stopped = []
+    for container in get_containers_data(containers=summaries):
+        if container['status'] == 'running':
+            running.append(container)
+        else:
+            stopped.append(container)
+    
+    return running, stopped
+
+
+@ttl_cache(DOCKER_CACHE_TTL)
+def get_stopped_containers():
+    """Get information for all non-running containers (filtered by the Docker daemon)"""
+    if not client:
+        return []
+    
+    try:
+        summaries = client.api.containers(all=True, filters={'status': STOPPED_STATUSES})
+    except Exception as e:
+        print(f"Error retrieving containers: {e}")
+        return []
+    
+    return get_containers_data(containers=summaries)
+
+
+@ttl_cache(RESOURCE_CACHE_TTL)
+def _build_network_index():
+    """
+    Map network names to the containers attached to them, from one container listing
+    
+    Returns:
+        Dict {network_name: [(container, endpoint settings), ...]}
+    """
+    index = defaultdict(list)
+    for container in client.containers.list(all=True):
+        network_settings = container.attrs.get('NetworkSettings', {})
+        for net_name, net_info in network_settings.get('Networks', {}).items():
+            index[net_name].append((container, net_info))
+    return index
+
+
+@ttl_cache(RESOURCE_CACHE_TTL)
 def get_networks_data():
     """Get Docker networks information"""
     if not client:
@@ -510,38 +938,27 @@ def get_networks_data():
             # Get connected containers
             connected_containers = []
             
-            # Debug: print network info
-            print(f"🌐 Processing network: {network.name}")
+            # Debug: log network info (only formatted with DW_DEBUG set)
+            logger.debug("🌐 Processing network: %s", network.name)
             
             containers_in_network = network.attrs.get('Containers', {})
-            print(f"   Found {len(containers_in_network)} containers in network")
+            logger.debug("   Found %d containers in network", len(containers_in_network))
             
             # If no containers found, try alternative method
             if not containers_in_network:
-                print(f"   ⚠️  No containers in attrs, trying alternative method...")
+                logger.debug("   ⚠️  No containers in attrs, trying alternative method...")
                 
-                # Alternative method: search all containers and see which are connected
-                all_containers = client.containers.list(all=True)
-                for container in all_containers:
-                    network_settings = container.attrs.get('NetworkSettings', {})
-                    networks_dict = network_settings.get('Networks', {})
-                    
-                    if network.name in networks_dict:
-                        net_info = networks_dict[network.name]
-                        
-                        # Get IPv4
-                        ipv4 = net_info.get('IPAddress', 'N/A')
-                        ipv6 = net_info.get('GlobalIPv6Address', 'N/A')
-                        
-                        connected_containers.append({
-                            'id': container.short_id,
-                            'name': container.name,
-                            'ipv4': ipv4,
-                            'ipv6': ipv6,
-                            'status': container.status
-                        })
-                        
-                        print(f"   ✅ Found via alternative: {container.name} ({ipv4})")
+                # Alternative method: look the network up in the shared membership index
+                for container, net_info in _build_network_index().get(network.name, []):
+                    ipv4 = net_info.get('IPAddress', 'N/A')
+                    connected_containers.append({
+                        'id': container.short_id,
+                        'name': container.name,
+                        'ipv4': ipv4,
+                        'ipv6': net_info.get('GlobalIPv6Address', 'N/A'),
+                        'status': container.status
+                    })
+                    logger.debug("   ✅ Found via alternative: %s (%s)", container.name, ipv4)
             else:
                 # Standard method
                 for container_id, container_info in containers_in_network.items():
@@ -564,7 +981,7 @@ def get_networks_data():
                             'status': container.status
                         })
                         
-                        print(f"   ✅ Added container: {container.name} ({ipv4})")
+                        logger.debug("   ✅ Added container: %s (%s)", container.name, ipv4)
                         
                     except Exception as e:
                         print(f"   ❌ Error getting container {container_id[:12]}: {e}")
@@ -587,21 +1004,21 @@ def get_networks_data():
                 'container_count': len(connected_containers)
             })
             
-            print(f"   📊 Network {network.name}: {len(connected_containers)} containers added")
+            logger.debug("   📊 Network %s: %d containers added", network.name, len(connected_containers))
         
         # Sort by container count (descending)
         networks_data.sort(key=lambda x: x['container_count'], reverse=True)
         
-        print(f"✅ Total networks processed: {len(networks_data)}")
+        logger.debug("✅ Total networks processed: %d", len(networks_data))
         return networks_data
         
     except Exception as e:
         print(f"❌ Error retrieving networks: {e}")
-        import traceback
         traceback.print_exc()
         return []
 
 
+@ttl_cache(RESOURCE_CACHE_TTL)
 def get_volumes_data():
     """Get Docker volumes information"""
     if not client:
@@ -614,20 +1031,23 @@ def get_volumes_data():
         # Get all containers to check which volumes are in use
         all_containers = client.containers.list(all=True)
         
+        # Index volume name -> containers using it, in one pass over all mounts
+        volume_users = defaultdict(list)
+        for container in all_containers:
+            attrs = container.attrs
+            for mount in attrs.get('Mounts', []):
+                if mount.get('Type') == 'volume':
+                    volume_users[mount.get('Name')].append({
+                        'id': container.short_id,
+                        'name': container.name,
+                        'status': attrs['State']['Status'],
+                        'destination': mount.get('Destination', 'N/A'),
+                        'mode': mount.get('Mode', 'rw')
+                    })
+        
         for volume in volumes:
             # Find containers using this volume
-            using_containers = []
-            for container in all_containers:
-                mounts = container.attrs.get('Mounts', [])
-                for mount in mounts:
-                    if mount.get('Type') == 'volume' and mount.get('Name') == volume.name:
-                        using_containers.append({
-                            'id': container.short_id,
-                            'name': container.name,
-                            'status': container.status,
-                            'destination': mount.get('Destination', 'N/A'),
-                            'mode': mount.get('Mode', 'rw')
-                        })
+            using_containers = volume_users.get(volume.name, [])
             
             volumes_data.append({
                 'name': volume.name,
@@ -666,11 +1086,9 @@ def home():
         }
     
     images = get_images_data()
-    running_containers = get_containers_data(running_only=True)
-    stopped_containers = get_containers_data(running_only=False)
     
-    # Filter only stopped containers
-    stopped_containers = [c for c in stopped_containers if c['status'] != 'running']
+    # One listing and one inspect batch for both tables
+    running_containers, stopped_containers = get_containers_data_split()
     
     return render_template('index.html', 
                          stats=stats,
@@ -696,11 +1114,10 @@ def api_images():
 @app.route('/api/containers/<status>')
 def api_containers(status):
     """API endpoint to get containers (running/stopped)"""
-    running_only = status == 'running'
-    containers = get_containers_data(running_only=running_only)
-    
     if status == 'stopped':
-        containers = [c for c in containers if c['status'] != 'running']
+        containers = get_stopped_containers()
+    else:
+        containers = get_containers_data(running_only=status == 'running')
     
     return jsonify(containers)
 
@@ -728,6 +1145,336 @@ def container_detail(container_id):
         return f"Error: {e}", 404
 
 
+def _parse_stats(container_id, stats, now=None):
+    """
+    Convert a raw Docker stats snapshot into dashboard values
+    
+    Args:
+        container_id: Container ID (key for rate calculation)
+        stats: Raw stats snapshot (API, stream frame or cgroup reader)
+        now: time.time() of the sample (defaults to current time)
+    
+    Returns:
+        Dict with CPU/memory percentages and network/disk rates
+    """
+    # Cumulative CPU counters; CPU% comes from their delta since the previous
+    # sample of this container (precpu_stats is not used)
+    try:
+        cpu_stats = stats['cpu_stats']
+        cpu_total = cpu_stats['cpu_usage']['total_usage']
+        cpu_system = cpu_stats.get('system_cpu_usage', 0)
+        online_cpus = cpu_stats.get('online_cpus', 1)
+    except (KeyError, TypeError) as e:
+        print(f"⚠️  CPU counters missing for {container_id}: {e}")
+        cpu_total = cpu_system = 0
+        online_cpus = 1
+    
+    # Calculate Memory usage with error handling
+    memory_stats = stats['memory_stats']
+    mem_usage = memory_stats.get('usage', 0)
+    mem_limit = memory_stats.get('limit', 1)
+    mem_percent = (mem_usage / mem_limit) * 100.0 if mem_limit > 0 else 0.0
+    mem_usage_mb = mem_usage / _MB
+    mem_limit_mb = mem_limit / _MB
+    
+    # Calculate Network I/O - cumulative values in bytes
+    networks = stats.get('networks', {})
+    net_input_cumulative = 0
+    net_output_cumulative = 0
+    try:
+        for net in networks.values():
+            net_input_cumulative += net.get('rx_bytes', 0)
+            net_output_cumulative += net.get('tx_bytes', 0)
+    except (KeyError, TypeError, AttributeError):
+        pass
+    
+    # Calculate Disk I/O - cumulative values in bytes
+    blkio_stats = stats.get('blkio_stats', {})
+    io_service_bytes = blkio_stats.get('io_service_bytes_recursive', [])
+    disk_read_cumulative = 0
+    disk_write_cumulative = 0
+    try:
+        # Single pass over the entries for both directions
+        for item in io_service_bytes or ():
+            op = item.get('op')
+            if op == 'Read':
+                disk_read_cumulative += item['value']
+            elif op == 'Write':
+                disk_write_cumulative += item['value']
+    except (KeyError, TypeError):
+        pass
+    
+    # Calculate rates using cumulative values
+    if now is None:
+        now = time.time()
+    cumulative_values = {
+        'net_in': net_input_cumulative,
+        'net_out': net_output_cumulative,
+        'disk_read': disk_read_cumulative,
+        'disk_write': disk_write_cumulative,
+        'cpu_total': cpu_total,
+        'cpu_system': cpu_system,
+        'online_cpus': online_cpus
+    }
+    rates = calculate_rate(container_id, cumulative_values, now)
+    
+    return {
+        'timestamp': datetime.fromtimestamp(now).isoformat(),
+        'cpu_percent': round(rates['cpu_percent'], 2),
+        'mem_usage_mb': round(mem_usage_mb, 2),
+        'mem_limit_mb': round(mem_limit_mb, 2),
+        'mem_percent': round(mem_percent, 2),
+        'net_input_mb': round(rates['net_input_mb_s'], 2),
+        'net_output_mb': round(rates['net_output_mb_s'], 2),
+        'disk_read_mb': round(rates['disk_read_mb_s'], 2),
+        'disk_write_mb': round(rates['disk_write_mb_s'], 2)
+    }
+
+
+def _get_one_shot_stats(container_id):
+    """
+    Fetch one stats snapshot without the daemon's 1s CPU pre-sample
+    
+    Uses docker-py's low-level request helpers (what APIClient.stats does
+    internally) so the body is parsed once by orjson, when available,
+    instead of stdlib json.
+    
+    Args:
+        container_id: Container ID or name
+    
+    Returns:
+        Raw stats dict
+    """
+    if orjson is None:
+        return client.api.stats(container_id, stream=False, one_shot=True)
+    
+    api = client.api
+    response = api._get(
+        api._url('/containers/{0}/stats', container_id),
+        params={'stream': False, 'one-shot': True}
+    )
+    api._raise_for_status(response)
+    return orjson.loads(response.content)
+
+
+# ===== CGROUP STATS =====
+
+# On native Linux the counters behind the stats endpoint are read straight from
+# the container's cgroup and network namespace, skipping the daemon entirely.
+# Both roots must be the host's (mount them when running in a container); a
+# container whose files are not found falls back to the Docker API, which is
+# always the case on Docker Desktop where the daemon runs in a VM.
+CGROUP_STATS = os.getenv('DW_CGROUP_STATS', 'true').lower() == 'true'
+CGROUP_ROOT = os.getenv('DW_CGROUP_ROOT', '/sys/fs/cgroup')
+PROC_ROOT = os.getenv('DW_PROC_ROOT', '/proc')
+
+# Nanoseconds per clock tick, for /proc/stat
+_NS_PER_TICK = 1e9 / os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 1e7
+
+# Host RAM, reported as the limit of containers without a memory limit
+_HOST_MEMORY = psutil.virtual_memory().total
+_ONLINE_CPUS = os.cpu_count() or 1
+
+
+def _detect_cgroup_version():
+    """Return 2 for the unified hierarchy, 1 for legacy controllers, None if there is no cgroupfs"""
+    if not CGROUP_STATS:
+        return None
+    if os.path.exists(os.path.join(CGROUP_ROOT, 'cgroup.controllers')):
+        return 2
+    if os.path.isdir(os.path.join(CGROUP_ROOT, 'memory')):
+        return 1
+    return None
+
+
+CGROUP_VERSION = _detect_cgroup_version()
+
+
+def _read_int(path):
+    with open(path) as f:
+        return int(f.read())
+
+
+def _find_cgroup_dir(controller_root, container_id):
+    """Locate a container's cgroup under the systemd or cgroupfs driver layout"""
+    for path in (
+        os.path.join(controller_root, 'system.slice', f'docker-{container_id}.scope'),
+        os.path.join(controller_root, 'docker', container_id)
+    ):
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def _read_system_cpu_usage():
+    """Host CPU time in nanoseconds, computed like the daemon's system_cpu_usage"""
+    with open(os.path.join(PROC_ROOT, 'stat')) as f:
+        fields = f.readline().split()
+    # user nice system idle iowait irq softirq
+    return int(sum(int(v) for v in fields[1:8]) * _NS_PER_TICK)
+
+
+def _read_net_dev(pid):
+    """Per-interface rx/tx byte counters of a process's network namespace"""
+    networks = {}
+    with open(os.path.join(PROC_ROOT, str(pid), 'net', 'dev')) as f:
+        lines = f.readlines()[2:]  # Two header lines
+    for line in lines:
+        iface, _, counters = line.partition(':')
+        iface = iface.strip()
+        if iface == 'lo':
+            continue
+        values = counters.split()
+        networks[iface] = {'rx_bytes': int(values[0]), 'tx_bytes': int(values[8])}
+    return networks
+
+
+def _read_cgroup_v2(container_id):
+    """Read CPU, memory and block I/O counters from the unified hierarchy"""
+    path = _find_cgroup_dir(CGROUP_ROOT, container_id)
+    if path is None:
+        return None
+    
+    total_usage = 0
+    with open(os.path.join(path, 'cpu.stat')) as f:
+        for line in f:
+            if line.startswith('usage_usec '):
+                total_usage = int(line[11:]) * 1000
+                break
+    
+    usage = _read_int(os.path.join(path, 'memory.current'))
+    with open(os.path.join(path, 'memory.max')) as f:
+        limit = f.read().strip()
+    limit = _HOST_MEMORY if limit == 'max' else int(limit)
+    
+    read_bytes = write_bytes = 0
+    with open(os.path.join(path, 'io.stat')) as f:
+        for line in f:
+            for field in line.split()[1:]:
+                key, _, value = field.partition('=')
+                if key == 'rbytes':
+                    read_bytes += int(value)
+                elif key == 'wbytes':
+                    write_bytes += int(value)
+    
+    return total_usage, usage, limit, read_bytes, write_bytes
+
+
+def _read_cgroup_v1(container_id):
+    """Read CPU, memory and block I/O counters from the legacy controllers"""
+    memory_path = _find_cgroup_dir(os.path.join(CGROUP_ROOT, 'memory'), container_id)
+    if memory_path is None:
+        return None
+    cpuacct_path = _find_cgroup_dir(os.path.join(CGROUP_ROOT, 'cpuacct'), container_id)
+    blkio_path = _find_cgroup_dir(os.path.join(CGROUP_ROOT, 'blkio'), container_id)
+    if cpuacct_path is None or blkio_path is None:
+        return None
+    
+    total_usage = _read_int(os.path.join(cpuacct_path, 'cpuacct.usage'))
+    usage = _read_int(os.path.join(memory_path, 'memory.usage_in_bytes'))
+    # Unlimited is reported as a huge page-aligned number
+    limit = min(_read_int(os.path.join(memory_path, 'memory.limit_in_bytes')), _HOST_MEMORY)
+    
+    read_bytes = write_bytes = 0
+    with open(os.path.join(blkio_path, 'blkio.throttle.io_service_bytes_recursive')) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) != 3:
+                continue  # "Total <n>" summary line
+            if fields[1] == 'Read':
+                read_bytes += int(fields[2])
+            elif fields[1] == 'Write':
+                write_bytes += int(fields[2])
+    
+    return total_usage, usage, limit, read_bytes, write_bytes
+
+
+def _read_cgroup_stats(container_id, attrs):
+    """
+    Build a stats snapshot from cgroup and /proc counters
+    
+    The result has the shape of the stats endpoint's response (only the
+    fields _parse_stats reads).
+    
+    Args:
+        container_id: Full container ID
+        attrs: Container inspect data (for the PID and network mode)
+    
+    Returns:
+        Raw stats dict, or None if the container's cgroup is not readable
+    """
+    if CGROUP_VERSION is None:
+        return None
+    
+    try:
+        reader = _read_cgroup_v2 if CGROUP_VERSION == 2 else _read_cgroup_v1
+        counters = reader(container_id)
+        if counters is None:
+            return None
+        total_usage, usage, limit, read_bytes, write_bytes = counters
+        
+        # Host-mode containers share the host's interfaces and report no networks
+        pid = attrs['State'].get('Pid')
+        networks = {}
+        if pid and attrs['HostConfig'].get('NetworkMode') != 'host':
+            networks = _read_net_dev(pid)
+        
+        system_cpu_usage = _read_system_cpu_usage()
+    except (OSError, ValueError, IndexError, KeyError) as e:
+        logger.debug("cgroup stats unavailable for %s: %s", container_id[:12], e)
+        return None
+    
+    return {
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': total_usage},
+            'system_cpu_usage': system_cpu_usage,
+            'online_cpus': _ONLINE_CPUS
+        },
+        'memory_stats': {'usage': usage, 'limit': limit},
+        'networks': networks,
+        'blkio_stats': {'io_service_bytes_recursive': [
+            {'op': 'Read', 'value': read_bytes},
+            {'op': 'Write', 'value': write_bytes}
+        ]}
+    }
+
+
+def _fetch_collector_sample(container_id):
+    """
+    Inspect a container and get its stats (runs in stats_executor)
+    
+    Counters are read from the container's cgroup when available; otherwise
+    the latest streamed frame is used when fresh, or a one-shot snapshot is
+    requested (and a stream opened for the next cycles).
+    
+    Returns:
+        Tuple of (inspect attrs, raw stats, time.time() the stats were taken)
+    """
+    attrs = client.api.inspect_container(container_id)
+    stats = _read_cgroup_stats(container_id, attrs)
+    if stats is not None:
+        sampled_at = time.time()
+        if container_id in _stats_streams:
+            stop_stats_stream(container_id)
+        return attrs, stats, sampled_at
+    
+    stats = latest_streamed_stats(container_id)
+    if stats is None:
+        stats = _get_one_shot_stats(container_id)
+        if STATS_STREAMING:
+            start_stats_stream(container_id)
+    return attrs, stats, time.time()
+
+
+def _fetch_container_stats(container):
+    """Fetch and parse stats for one container (runs in stats_executor)"""
+    try:
+        return container.short_id, _parse_stats(container.short_id, _get_one_shot_stats(container.short_id))
+    except Exception as e:
+        print(f"❌ Error stats container {container.short_id}: {e}")
+        return container.short_id, {'error': str(e)}
+
+
 @app.route('/api/container/<container_id>/stats')
 def api_container_stats(container_id):
     """API to get container real-time statistics"""
@@ -735,84 +1482,33 @@ def api_container_stats(container_id):
         return jsonify({'error': 'Docker not available'}), 500
     
     try:
-        container = client.containers.get(container_id)
-        stats = container.stats(stream=False)
-        
-        # Calculate CPU percentage with error handling
-        cpu_percent = 0.0
-        try:
-            cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
-                        stats['precpu_stats']['cpu_usage']['total_usage']
-            system_delta = stats['cpu_stats'].get('system_cpu_usage', 0) - \
-                           stats['precpu_stats'].get('system_cpu_usage', 0)
-            cpu_count = stats['cpu_stats'].get('online_cpus', 1)
-            
-            if system_delta > 0 and cpu_delta > 0:
-                cpu_percent = (cpu_delta / system_delta) * cpu_count * 100.0
-        except (KeyError, TypeError, ZeroDivisionError) as e:
-            print(f"⚠️  CPU calculation failed for {container_id}: {e}")
-            cpu_percent = 0.0
-        
-        # Calculate Memory usage with error handling
-        mem_usage = stats['memory_stats'].get('usage', 0)
-        mem_limit = stats['memory_stats'].get('limit', 1)
-        mem_percent = (mem_usage / mem_limit) * 100.0 if mem_limit > 0 else 0.0
-        mem_usage_mb = mem_usage / (1024 * 1024)
-        mem_limit_mb = mem_limit / (1024 * 1024)
-        
-        # Calculate Network I/O - cumulative values in bytes
-        networks = stats.get('networks', {})
-        net_input_cumulative = 0
-        net_output_cumulative = 0
-        try:
-            net_input_cumulative = sum(net.get('rx_bytes', 0) for net in networks.values())
-            net_output_cumulative = sum(net.get('tx_bytes', 0) for net in networks.values())
-        except (KeyError, TypeError, AttributeError):
-            pass
-        
-        # Calculate Disk I/O - cumulative values in bytes
-        blkio_stats = stats.get('blkio_stats', {})
-        io_service_bytes = blkio_stats.get('io_service_bytes_recursive', [])
-        disk_read_cumulative = 0
-        disk_write_cumulative = 0
-        try:
-            disk_read_cumulative = sum(item['value'] for item in io_service_bytes if item.get('op') == 'Read')
-            disk_write_cumulative = sum(item['value'] for item in io_service_bytes if item.get('op') == 'Write')
-        except (KeyError, TypeError):
-            pass
-        
-        # Calculate rates using cumulative values
-        current_time = datetime.now()
-        cumulative_values = {
-            'net_in': net_input_cumulative,
-            'net_out': net_output_cumulative,
-            'disk_read': disk_read_cumulative,
-            'disk_write': disk_write_cumulative
-        }
-        rates = calculate_rate(container_id, cumulative_values, current_time)
-        
-        current_stats = {
-            'timestamp': current_time.isoformat(),
-            'cpu_percent': round(cpu_percent, 2),
-            'mem_usage_mb': round(mem_usage_mb, 2),
-            'mem_limit_mb': round(mem_limit_mb, 2),
-            'mem_percent': round(mem_percent, 2),
-            'net_input_mb': round(rates['net_input_mb_s'], 2),
-            'net_output_mb': round(rates['net_output_mb_s'], 2),
-            'disk_read_mb': round(rates['disk_read_mb_s'], 2),
-            'disk_write_mb': round(rates['disk_write_mb_s'], 2)
-        }
+        stats = _get_one_shot_stats(container_id)
+        current_stats = _parse_stats(container_id, stats)
         
         # DO NOT save to database here - only background thread does it
         
         return jsonify(current_stats)
     except Exception as e:
         print(f"❌ Error stats container {container_id}: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/containers/stats')
+def api_containers_stats():
+    """API to get real-time statistics for all running containers at once"""
+    if not client:
+        return jsonify({'error': 'Docker not available'}), 500
+    
+    try:
+        containers = client.containers.list()
+        # Fetch per-container stats concurrently (one daemon round trip each)
+        return jsonify(dict(stats_executor.map(_fetch_container_stats, containers)))
+    except Exception as e:
+        print(f"❌ Error retrieving containers stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/container/<container_id>/stats/history')
 def api_container_stats_history(container_id):
     """API to get statistics history (last 7 days)"""
@@ -827,15 +1523,26 @@ def api_container_logs(container_id):
         return jsonify({'error': 'Docker not available'}), 500
     
     try:
-        container = client.containers.get(container_id)
         # Modified: now we get the last 100 logs instead of 10
-        logs = container.logs(tail=100, timestamps=True).decode('utf-8')
+        # (low-level call: skips the inspect request behind containers.get)
+        stream = client.api.logs(container_id, tail=100, timestamps=True, stream=True, follow=False)
         
-        # Format logs into array
-        log_lines = []
-        for line in logs.strip().split('\n'):
-            if line:
-                log_lines.append(line)
+        # Read chunks into a bounded buffer, keeping only the newest LOGS_MAX_BYTES
+        buf = bytearray()
+        truncated = False
+        try:
+            for chunk in stream:
+                buf += chunk
+                if len(buf) > LOGS_MAX_BYTES:
+                    del buf[:len(buf) - LOGS_MAX_BYTES]
+                    truncated = True
+        finally:
+            stream.close()
+        
+        # Format logs into array, decoding line by line (first line may be partial if truncated)
+        log_lines = [line.decode('utf-8', errors='replace') for line in buf.splitlines() if line]
+        if truncated and log_lines:
+            log_lines.pop(0)
         
         return jsonify({'logs': log_lines})
     except Exception as e:
@@ -941,30 +1648,31 @@ def api_network_topology(network_id):
             nodes[0]['info']['subnet'] = ipam_config[0].get('Subnet', 'N/A')
             nodes[0]['info']['gateway'] = ipam_config[0].get('Gateway', 'N/A')
         
-        # Find connected containers (alternative method)
+        # Find connected containers; Container objects come from the shared
+        # membership index (one listing, attrs included) rather than one
+        # inspect per container
         connected_containers = []
         containers_in_network = network.attrs.get('Containers', {})
+        members = _build_network_index().get(network.name, [])
         
         if not containers_in_network:
-            # Alternative method
-            all_containers = client.containers.list(all=True)
-            for container in all_containers:
-                network_settings = container.attrs.get('NetworkSettings', {})
-                networks_dict = network_settings.get('Networks', {})
-                
-                if network.name in networks_dict:
-                    net_info = networks_dict[network.name]
-                    connected_containers.append({
-                        'container': container,
-                        'ipv4': net_info.get('IPAddress', 'N/A'),
-                        'ipv6': net_info.get('GlobalIPv6Address', 'N/A'),
-                        'mac': net_info.get('MacAddress', 'N/A')
-                    })
+            # Alternative method (shared membership index, O(1) per network)
+            for container, net_info in members:
+                connected_containers.append({
+                    'container': container,
+                    'ipv4': net_info.get('IPAddress', 'N/A'),
+                    'ipv6': net_info.get('GlobalIPv6Address', 'N/A'),
+                    'mac': net_info.get('MacAddress', 'N/A')
+                })
         else:
             # Standard method
+            containers_by_id = {container.id: container for container, _ in members}
             for container_id, container_info in containers_in_network.items():
                 try:
-                    container = client.containers.get(container_id)
+                    container = containers_by_id.get(container_id)
+                    if container is None:
+                        # Connected after the index was built
+                        container = client.containers.get(container_id)
                     ipv4_raw = container_info.get('IPv4Address', '')
                     ipv4 = ipv4_raw.split('/')[0] if ipv4_raw else 'N/A'
                     
@@ -1028,7 +1736,8 @@ def api_network_topology(network_id):
                     'id': container.short_id,
                     'name': container.name,
                     'status': container.status,
-                    'image': container.image.tags[0] if container.image.tags else 'unknown',
+                    # Image reference from attrs (container.image would inspect the image)
+                    'image': container.attrs.get('Config', {}).get('Image') or 'unknown',
                     'ipv4': item['ipv4'],
                     'ipv6': item['ipv6'],
                     'mac': item['mac'],
@@ -1058,7 +1767,6 @@ def api_network_topology(network_id):
         
     except Exception as e:
         print(f"❌ Topology error: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -1077,6 +1785,190 @@ def api_volumes():
     return jsonify(volumes)
 
 
+# ===== STREAMING STATS =====
+
+# One long-lived stats stream per running container whose cgroup can't be read
+# (all of them without a cgroupfs); the daemon pushes a frame every second and
+# the collector reads the latest one from memory
+STATS_STREAMING = os.getenv('DW_STATS_STREAMING', 'true').lower() == 'true'
+STATS_STREAM_MAX_AGE = 5.0  # seconds, older frames fall back to a one-shot request
+
+# Each open stream holds a pooled connection; keep half the pool for everything
+# else (containers beyond the limit use one-shot requests)
+STATS_STREAM_LIMIT = DOCKER_POOL_SIZE // 2
+
+_stats_streams = {}  # {container_id: _StatsStream}
+_stats_streams_lock = threading.Lock()
+
+
+class _StatsStream:
+    """Open stats stream of one container and the last frame received from it"""
+    __slots__ = ('stream', 'latest', 'received', 'closed')
+    
+    def __init__(self):
+        self.stream = None  # CancellableStream, set once the request is open
+        self.latest = None
+        self.received = 0.0  # time.monotonic() of latest
+        self.closed = False
+
+
+def _read_stats_stream(container_id, state):
+    """Store each frame of a container's stats stream until it ends or is closed"""
+    loads = orjson.loads if orjson is not None else json.loads
+    api = client.api
+    try:
+        response = api._get(
+            api._url('/containers/{0}/stats', container_id),
+            params={'stream': True},
+            stream=True
+        )
+        api._raise_for_status(response)
+        state.stream = CancellableStream(response.iter_lines(), response)
+        if state.closed:
+            return  # Stopped while the request was opening
+        
+        for line in state.stream:
+            if state.closed:
+                break
+            if line:
+                state.latest = loads(line)
+                state.received = time.monotonic()
+    except Exception as e:
+        logger.debug("Stats stream for %s ended: %s", container_id[:12], e)
+    finally:
+        if state.stream is not None:
+            state.stream.close()
+        with _stats_streams_lock:
+            if _stats_streams.get(container_id) is state:
+                del _stats_streams[container_id]
+
+
+def start_stats_stream(container_id):
+    """Open a stats stream for a container unless one is running or the limit is reached"""
+    with _stats_streams_lock:
+        if container_id in _stats_streams or len(_stats_streams) >= STATS_STREAM_LIMIT:
+            return
+        state = _StatsStream()
+        _stats_streams[container_id] = state
+    
+    threading.Thread(
+        target=_read_stats_stream, args=(container_id, state),
+        name=f'stats-stream-{container_id[:12]}', daemon=True
+    ).start()
+
+
+def stop_stats_stream(container_id):
+    """Close a container's stats stream (its reader thread then exits)"""
+    with _stats_streams_lock:
+        state = _stats_streams.pop(container_id, None)
+    if state is None:
+        return
+    
+    state.closed = True
+    if state.stream is not None:
+        try:
+            state.stream.close()
+        except Exception:
+            pass
+
+
+def latest_streamed_stats(container_id):
+    """
+    Get the latest streamed stats frame of a container
+    
+    Args:
+        container_id: Full container ID
+    
+    Returns:
+        Raw stats dict, or None if there is no stream or its frame is older
+        than STATS_STREAM_MAX_AGE
+    """
+    state = _stats_streams.get(container_id)
+    if state is None or state.latest is None:
+        return None
+    if time.monotonic() - state.received > STATS_STREAM_MAX_AGE:
+        return None
+    return state.latest
+
+
+def _sync_stats_streams():
+    """
+    Close the streams of containers no longer running
+    
+    Without a cgroupfs, streams are also opened for all running containers;
+    otherwise the collector opens them for the containers it can't read.
+    """
+    running = {summary['Id'] for summary in client.api.containers()}
+    if CGROUP_VERSION is None:
+        for container_id in running:
+            start_stats_stream(container_id)
+    
+    with _stats_streams_lock:
+        stale = [container_id for container_id in _stats_streams if container_id not in running]
+    for container_id in stale:
+        stop_stats_stream(container_id)
+
+
+# Docker events the watcher subscribes to (filter values are OR'ed per key)
+WATCHED_EVENTS = {
+    'type': ['container', 'network', 'volume'],
+    'event': ['start', 'die', 'destroy', 'create', 'connect', 'disconnect']
+}
+
+
+def _invalidate_resource_caches(event_type):
+    """Drop cached listings affected by a network/volume change (or a container create/removal)"""
+    if event_type in ('network', 'container'):
+        get_networks_data.cache_clear()
+        _build_network_index.cache_clear()
+    if event_type in ('volume', 'container'):
+        get_volumes_data.cache_clear()
+
+
+def watch_docker_events(manage_streams=True):
+    """
+    Follow Docker events (reconnects if the event stream drops)
+    
+    Container start/die events open (without a cgroupfs) and close stats
+    streams; network and volume changes, and containers being created or
+    removed, invalidate the cached listings.
+    
+    Args:
+        manage_streams: Whether this process keeps the stats streams (only
+            the collector's owner needs them)
+    """
+    print("🔄 Docker events thread started")
+    
+    while True:
+        if client:
+            try:
+                # Subscribe before syncing so no event in between is missed
+                events = client.api.events(decode=True, filters=WATCHED_EVENTS)
+                if manage_streams:
+                    _sync_stats_streams()
+                # Anything may have changed while disconnected
+                _invalidate_resource_caches('container')
+                
+                for event in events:
+                    event_type = event.get('Type')
+                    action = event.get('Action')
+                    if event_type != 'container' or action in ('create', 'destroy'):
+                        _invalidate_resource_caches(event_type)
+                        continue
+                    
+                    container_id = event.get('Actor', {}).get('ID') or event.get('id')
+                    if not manage_streams or not container_id:
+                        continue
+                    if action == 'start' and CGROUP_VERSION is None:
+                        start_stats_stream(container_id)
+                    elif action == 'die':
+                        stop_stats_stream(container_id)
+            except Exception as e:
+                print(f"⚠️  Docker events stream interrupted: {e}")
+        
+        time.sleep(5)
+
+
 def collect_stats_background():
     """Function that collects statistics in background every minute"""
     print("🔄 Statistics collection thread started")
@@ -1094,167 +1986,177 @@ def collect_stats_background():
             alert_manager = None
             email_sender = None
     
+    # Cycles start on a fixed monotonic schedule, so their duration doesn't
+    # add to the period
+    next_tick = time.monotonic()
+    
     while True:
         if client:
             try:
-                containers = client.containers.list()
+                # Plain summaries: containers.list() would inspect each container serially
+                containers = client.api.containers()
                 print(f"\n📊 Collecting stats for {len(containers)} containers...")
                 
                 # Prepare data for alert checking
                 containers_data_for_alerts = []
+                # Stats rows written to the database in one transaction per cycle
+                stats_rows = []
+                
+                # Inspect and request one-shot stats for all containers concurrently
+                # (bounded by the pool size); keyed by full ID so the baselines stay
+                # separate from the dashboard's short-ID requests
+                futures = {
+                    stats_executor.submit(_fetch_collector_sample, summary['Id']): summary
+                    for summary in containers
+                }
+                done, not_done = wait(futures, timeout=STATS_FETCH_TIMEOUT)
+                for future in not_done:
+                    future.cancel()
+                    print(f"  ⏱️  Stats request timed out for {futures[future]['Names'][0].lstrip('/')}")
+                
+                # One timestamp for the whole cycle's database rows (rates use
+                # each sample's own fetch time)
+                now_int = int(time.time())
                 
-                for container in containers:
+                for future in done:
+                    container_id = futures[future]['Id']
+                    name = futures[future]['Names'][0].lstrip('/')
                     try:
-                        stats = container.stats(stream=False)
-                        
-                        # Calculate CPU with error handling
-                        cpu_percent = 0.0
-                        try:
-                            cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
-                                        stats['precpu_stats']['cpu_usage']['total_usage']
-                            system_delta = stats['cpu_stats'].get('system_cpu_usage', 0) - \
-                                           stats['precpu_stats'].get('system_cpu_usage', 0)
-                            cpu_count = stats['cpu_stats'].get('online_cpus', 1)
-                            
-                            if system_delta > 0 and cpu_delta > 0:
-                                cpu_percent = (cpu_delta / system_delta) * cpu_count * 100.0
-                        except (KeyError, TypeError, ZeroDivisionError):
-                            cpu_percent = 0.0
+                        attrs, stats, sampled_at = future.result()
+                        name = attrs['Name'].lstrip('/')
                         
-                        # Calculate Memory with error handling
-                        mem_usage = stats['memory_stats'].get('usage', 0)
-                        mem_limit = stats['memory_stats'].get('limit', 1)
-                        mem_percent = (mem_usage / mem_limit) * 100.0 if mem_limit > 0 else 0.0
-                        mem_usage_mb = mem_usage / (1024 * 1024)
-                        mem_limit_mb = mem_limit / (1024 * 1024)
+                        # CPU delta is taken against this collector's previous sample
+                        current_stats = _parse_stats(container_id, stats, sampled_at)
+                        cpu_percent = current_stats['cpu_percent']
+                        mem_percent = current_stats['mem_percent']
                         
                         # Get health status
-                        health_status = 'none'
-                        if 'Health' in container.attrs['State']:
-                            health_status = container.attrs['State']['Health']['Status']
-                        
-                        # Calculate Network I/O - cumulative values in bytes
-                        networks = stats.get('networks', {})
-                        net_input_cumulative = 0
-                        net_output_cumulative = 0
-                        try:
-                            net_input_cumulative = sum(net.get('rx_bytes', 0) for net in networks.values())
-                            net_output_cumulative = sum(net.get('tx_bytes', 0) for net in networks.values())
-                        except (KeyError, TypeError, AttributeError):
-                            pass
-                        
-                        # Calculate Disk I/O - cumulative values in bytes
-                        blkio_stats = stats.get('blkio_stats', {})
-                        io_service_bytes = blkio_stats.get('io_service_bytes_recursive', [])
-                        disk_read_cumulative = 0
-                        disk_write_cumulative = 0
-                        try:
-                            disk_read_cumulative = sum(item['value'] for item in io_service_bytes if item.get('op') == 'Read')
-                            disk_write_cumulative = sum(item['value'] for item in io_service_bytes if item.get('op') == 'Write')
-                        except (KeyError, TypeError):
-                            pass
-                        
-                        # Calculate rates using cumulative values
-                        current_time = datetime.now()
-                        cumulative_values = {
-                            'net_in': net_input_cumulative,
-                            'net_out': net_output_cumulative,
-                            'disk_read': disk_read_cumulative,
-                            'disk_write': disk_write_cumulative
-                        }
-                        rates = calculate_rate(container.id, cumulative_values, current_time)
+                        health = attrs['State'].get('Health')
+                        health_status = health['Status'] if health is not None else 'none'
                         
-                        current_stats = {
-                            'timestamp': current_time.isoformat(),
-                            'cpu_percent': round(cpu_percent, 2),
-                            'mem_usage_mb': round(mem_usage_mb, 2),
-                            'mem_limit_mb': round(mem_limit_mb, 2),
-                            'mem_percent': round(mem_percent, 2),
-                            'net_input_mb': round(rates['net_input_mb_s'], 2),
-                            'net_output_mb': round(rates['net_output_mb_s'], 2),
-                            'disk_read_mb': round(rates['disk_read_mb_s'], 2),
-                            'disk_write_mb': round(rates['disk_write_mb_s'], 2)
-                        }
-                        
-                        # Save to database
-                        save_container_stats(container.short_id, container.name, current_stats)
-                        print(f"  ✅ {container.name}: CPU={cpu_percent:.1f}% RAM={mem_percent:.1f}% NET_IN={rates['net_input_mb_s']:.2f}MB/s")
+                        # Queue for database (saved once the cycle is complete)
+                        stats_rows.append(_stats_row(container_id[:12], name, now_int, current_stats))
+                        print(f"  ✅ {name}: CPU={cpu_percent:.1f}% RAM={mem_percent:.1f}% NET_IN={current_stats['net_input_mb']:.2f}MB/s")
                         
                         # Prepare data for alert checking
                         if alert_manager:
-                            containers_data_for_alerts.append({
-                                'container_id': container.id,
-                                'container_name': container.name,
-                                'cpu_percent': cpu_percent,
-                                'ram_percent': mem_percent,
-                                'health_status': health_status
-                            })
+                            containers_data_for_alerts.append(ContainerSample(
+                                container_id=container_id,
+                                container_name=name,
+                                cpu_percent=cpu_percent,
+                                ram_percent=mem_percent,
+                                health_status=health_status
+                            ))
                         
                     except Exception as e:
-                        print(f"  ❌ Error collecting stats for {container.name}: {e}")
-                
+                        print(f"  ❌ Error collecting stats for {name}: {e}")
+
+                # Save the whole cycle in one transaction
+                save_container_stats_batch(stats_rows)
+
                 # Check for alerts if system is enabled
                 if alert_manager and email_sender and containers_data_for_alerts:
                     try:
                         print("\n🚨 Checking for alerts...")
                         alert_batch = alert_manager.check_all_containers(containers_data_for_alerts)
                         
-                        # Send recovery emails (separate)
+                        # Send recovery emails (separate); emails are sent in the
+                        # background and saved to database once the result is known
                         if alert_batch.has_recovery():
                             for recovery_alert in alert_batch.recovery_alerts:
-                                email_sent = email_sender.send_recovery_email(recovery_alert)
-                                
-                                # Save to database
-                                batch_id = f"recovery_{recovery_alert.timestamp.isoformat()}"
-                                save_alert_to_database(recovery_alert, batch_id, email_sent)
-                                
-                                if email_sent:
-                                    print(f"   ✅ Recovery email sent for {recovery_alert.container_name}")
+                                email_sender.send_recovery_email(
+                                    recovery_alert,
+                                    on_complete=functools.partial(_on_recovery_email_sent, recovery_alert)
+                                )
                         
                         # Send aggregate alert email
                         if alert_batch.has_alerts():
-                            batch_id = f"batch_{alert_batch.timestamp.isoformat()}"
-                            email_sent = email_sender.send_alert_email(alert_batch)
-                            
-                            # Save all alerts to database
-                            for alert in alert_batch.critical_alerts + alert_batch.warning_alerts:
-                                save_alert_to_database(alert, batch_id, email_sent)
-                            
-                            if email_sent:
-                                critical_count = len(alert_batch.critical_alerts)
-                                warning_count = len(alert_batch.warning_alerts)
-                                print(f"   ✅ Alert email sent: {critical_count} critical, {warning_count} warning")
+                            email_sender.send_alert_email(
+                                alert_batch,
+                                on_complete=functools.partial(_on_alert_email_sent, alert_batch)
+                            )
                         else:
                             print("   ✓ No alerts triggered")
                             
                     except Exception as e:
                         print(f"   ❌ Error in alert system: {e}")
-                        import traceback
                         traceback.print_exc()
                 
-                # Database cleanup every cycle
-                cleanup_old_stats()
                 print("✅ Collection cycle completed\n")
                 
             except Exception as e:
                 print(f"❌ General error collecting stats: {e}")
         
-        time.sleep(60)  # Every minute
+        # Every minute; ticks missed by an overrunning cycle are skipped
+        next_tick += COLLECT_INTERVAL
+        current = time.monotonic()
+        if next_tick <= current:
+            next_tick += ((current - next_tick) // COLLECT_INTERVAL + 1) * COLLECT_INTERVAL
+        time.sleep(next_tick - current)
+
 
+# Lock file held by the one process that runs the collector, so several
+# server workers importing this module don't each collect and write stats
+COLLECTOR_LOCK_PATH = os.getenv('DW_COLLECTOR_LOCK', DB_PATH + '.lock')
+_collector_lock_file = None
 
-# Flag to avoid multiple thread starts
-stats_thread_started = False
 
-# Start thread for background statistics collection ONLY ONCE
-if not stats_thread_started:
+def acquire_collector_lock():
+    """
+    Try to become the process that runs the stats collector
+    
+    The lock is released by the OS when the process exits.
+    
+    Returns:
+        True if this process holds the lock (always True without fcntl)
+    """
+    global _collector_lock_file
+    if _collector_lock_file is not None:
+        return True
+    
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    
+    lock_file = open(COLLECTOR_LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    _collector_lock_file = lock_file
+    return True
+
+
+# Start the collector, retention cleanup and stats streams in one process only;
+# every process keeps its own system sampler and cache invalidation
+owns_collector = acquire_collector_lock()
+if owns_collector:
     stats_thread = threading.Thread(target=collect_stats_background, daemon=True)
     stats_thread.start()
-    stats_thread_started = True
     print("✅ Statistics collection thread started at initialization")
+    
+    cleanup_thread = threading.Thread(target=cleanup_background, daemon=True)
+    cleanup_thread.start()
+else:
+    print(f"ℹ️  Statistics collector already running in another process ({COLLECTOR_LOCK_PATH})")
+
+system_thread = threading.Thread(target=sample_system_background, daemon=True)
+system_thread.start()
+
+events_thread = threading.Thread(
+    target=watch_docker_events, args=(STATS_STREAMING and owns_collector,), daemon=True
+)
+events_thread.start()
 
 
 if __name__ == '__main__':
     
+    # Console output for modules using logging (e.g. alerts.email_sender)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Determine host and port from environment variables
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     port = int(os.getenv('FLASK_PORT', 5001))
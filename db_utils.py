@@ -5,7 +5,7 @@ Utility for DB interactions of Docker Watcher
 
 import sqlite3
 import os
-from datetime import datetime, timedelta
+import time
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'docker_stats.db')
 
@@ -24,11 +24,12 @@ def get_db_stats():
     unique_containers = cursor.fetchone()[0]
     
     # Oldest Record
-    cursor.execute('SELECT MIN(timestamp) FROM container_stats')
+    # Timestamps are stored as unix seconds, shown in local time
+    cursor.execute("SELECT datetime(MIN(timestamp), 'unixepoch', 'localtime') FROM container_stats")
     oldest_record = cursor.fetchone()[0]
     
     # Latest rescord
-    cursor.execute('SELECT MAX(timestamp) FROM container_stats')
+    cursor.execute("SELECT datetime(MAX(timestamp), 'unixepoch', 'localtime') FROM container_stats")
     newest_record = cursor.fetchone()[0]
     
     # DB dimension
@@ -56,11 +57,11 @@ def list_containers():
     cursor.execute('''
         SELECT container_id, container_name, 
                COUNT(*) as record_count,
-               MIN(timestamp) as first_seen,
-               MAX(timestamp) as last_seen
+               datetime(MIN(timestamp), 'unixepoch', 'localtime') as first_seen,
+               datetime(MAX(timestamp), 'unixepoch', 'localtime') as last_seen
         FROM container_stats
         GROUP BY container_id, container_name
-        ORDER BY last_seen DESC
+        ORDER BY MAX(timestamp) DESC
     ''')
     
     containers = cursor.fetchall()
@@ -82,7 +83,7 @@ def cleanup_old_data(days=7):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    limit_date = (datetime.now() - timedelta(days=days)).isoformat()
+    limit_date = int(time.time()) - days * 86400
     
     # Count removed records
     cursor.execute('SELECT COUNT(*) FROM container_stats WHERE timestamp < ?', (limit_date,))
@@ -116,7 +117,7 @@ def export_container_data(container_id, output_file='export.csv'):
     cursor = conn.cursor()
     
     cursor.execute('''
-        SELECT timestamp, cpu_percent, mem_usage_mb, mem_percent,
+        SELECT datetime(timestamp, 'unixepoch', 'localtime'), cpu_percent, mem_usage_mb, mem_percent,
                net_input_mb, net_output_mb, disk_read_mb, disk_write_mb
         FROM container_stats
         WHERE container_id = ?
@@ -144,9 +144,11 @@ function initCharts() {
 async function loadStatsHistory() {
     try {
         const response = await fetch(`/api/container/${containerId}/stats/history`);
+        // Columnar payload: {columns: [...], rows: [[...], ...]}
         const history = await response.json();
+        const rows = history.rows || [];
 
-        if (history.length === 0) {
+        if (rows.length === 0) {
             console.log('No history available yet');
             return;
         }
@@ -163,9 +165,12 @@ async function loadStatsHistory() {
         // No longer sampling - use ALL data
         // Removed this line: const step = Math.ceil(history.length / 100);
         
-        for (let i = 0; i < history.length; i++) {
-            const stat = history[i];
-            const date = new Date(stat.timestamp);
+        const col = {};
+        history.columns.forEach((name, index) => { col[name] = index; });
+
+        for (let i = 0; i < rows.length; i++) {
+            const row = rows[i];
+            const date = new Date(row[col.timestamp] * 1000);  // unix seconds
             
             // Format full timestamp for tooltip
             const fullTimestamp = date.toLocaleString('en-US', { 
@@ -179,12 +184,12 @@ async function loadStatsHistory() {
             
             labels.push(fullTimestamp);
             
-            cpuData.push(stat.cpu_percent);
-            memData.push(stat.mem_usage_mb);
-            netInData.push(stat.net_input_mb);
-            netOutData.push(stat.net_output_mb);
-            diskReadData.push(stat.disk_read_mb);
-            diskWriteData.push(stat.disk_write_mb);
+            cpuData.push(row[col.cpu_percent]);
+            memData.push(row[col.mem_usage_mb]);
+            netInData.push(row[col.net_input_mb]);
+            netOutData.push(row[col.net_output_mb]);
+            diskReadData.push(row[col.disk_read_mb]);
+            diskWriteData.push(row[col.disk_write_mb]);
         }
 
         // Update charts
@@ -206,7 +211,7 @@ async function loadStatsHistory() {
         diskChart.data.datasets[1].data = diskWriteData;
         diskChart.update();
 
-        console.log('✅ History loaded:', history.length, 'points');
+        console.log('✅ History loaded:', rows.length, 'points');
     } catch (error) {
         console.error('❌ Error loading history:', error);
     }